@@ -1,5 +1,7 @@
 import mimetypes
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import bpy
 
@@ -9,6 +11,9 @@ from ..utils import png_name_suffix, get_pref, get_temp_folder, save_image_to_te
     get_edit_main_image, calc_appropriate_aspect_ratio
 from ..utils.area import find_ai_image_editor_space_data, find_image_editor_areas
 
+if TYPE_CHECKING:
+    from ..studio.tasks import TaskResult, TaskState, Task
+
 
 def get_history_by_task_id(task_id):
     if oii := getattr(bpy.context.scene, "blender_ai_studio_property", None):
@@ -18,142 +23,148 @@ def get_history_by_task_id(task_id):
     return None
 
 
-def add_callback(task, temp_folder, generate_image_name):
-    from ..studio.tasks import TaskResult, TaskState, Task
-    task_id = task.task_id
-
-    # 2. 注册回调
-    def on_state_changed(event_data):
-        def f():
-            edit_history = get_history_by_task_id(task_id)
-            _task: Task = event_data["task"]
-            old_state: TaskState = event_data["old_state"]
-            new_state: TaskState = event_data["new_state"]
-            text = f"状态改变: {old_state.value} -> {new_state.value}"
-            logger.info(text)
-            try:
-                edit_history.running_state = new_state.value
-            except Exception as e:
-                logger.error(str(e))
-
-        bpy.app.timers.register(f, first_interval=0.1)
-
-    def on_progress(event_data):
-        def f():
-            # {
-            #     "current_step": 2,
-            #     "total_steps": 4,
-            #     "percentage": 0.5,
-            #     "message": "正在调用 API...",
-            #     "details": {},
-            # }
-            _task: Task = event_data["task"]
-            progress: dict = event_data["progress"]
-            percent = progress["percentage"]
-            message = progress["message"]
-            p = bpy.app.translations.pgettext("Progress")
-            text = f"{p}: {percent * 100}% - {message}"
-            edit_history = get_history_by_task_id(task_id)
+class _EditSession:
+    """单个编辑任务的回调
+    使用绑定方法注册回调, 提交任务时不再为每个回调创建闭包
+    回调在任务线程中触发, 通过 bpy.app.timers 切回主线程处理
+    """
 
-            try:
-                edit_history.running_progress = percent
-                edit_history.running_message = text
-            except Exception as e:
-                logger.error(str(e))
-            logger.info(text)
-
-        bpy.app.timers.register(f, first_interval=0.1)
-
-    def on_completed(event_data):
-        def f():
-            # result_data = {
-            #     "image_data": b"",
-            #     "mime_type": "image/png",
-            #     "width": 1024,
-            #     "height": 1024,
-            # }
-            edit_history = get_history_by_task_id(task_id)
-
-            _task: Task = event_data["task"]
-            result: TaskResult = event_data["result"]
-            results: list[tuple[str, str | bytes]] = result.data
-            if not results:
-                logger.warning("No results")
-                return
-
-            # 存储结果
-            result_data = results[0]
-            ext = mimetypes.guess_extension(result_data[0])
-            save_file = Path(temp_folder).joinpath(f"{generate_image_name}_Output{ext}")
-            save_file.write_bytes(result_data[1])
-            text = f"任务完成: {_task.task_id} {save_file}"
-            logger.info(text)
+    def __init__(self, task_id, temp_folder, generate_image_name):
+        self.task_id = task_id
+        self.temp_folder = temp_folder
+        self.generate_image_name = generate_image_name
+        self._progress_label = None
 
-            try:
-                edit_history.stop_running()
-                edit_history.running_state = "completed"
-                edit_history.running_message = "Running completed"
-
-                origin_image = edit_history.origin_image
-
-                if gi := bpy.data.images.load(str(save_file), check_existing=False):
-                    try:
-                        gi.preview_ensure()
-                        gi.name = generate_image_name
-
-                        gi.blender_ai_studio_property.origin_image = origin_image
-                        origin_image.blender_ai_studio_property.add_generated_image(gi)  # 处理多张图片
-
-                        space_data_list = find_ai_image_editor_space_data()  # 将图片加载到图片编辑器中
-                        for space_data in space_data_list:
-                            setattr(space_data, "image", gi)
-
-                        edit_history.add_generated_image(gi)
-                    except Exception as e:
-                        print("生成完成设置生成图像到活动项错误 error", e)
-                        import traceback
-                        traceback.print_exc()
-                        traceback.print_stack()
-                else:
-                    ut = bpy.app.translations.pgettext("Unable to load generated image!")
-                    edit_history.running_message = ut + " " + str(save_file)
+    def register(self, task):
+        task.register_callback("state_changed", self.on_state_changed)
+        task.register_callback("progress_updated", self.on_progress)
+        task.register_callback("completed", self.on_completed)
+        task.register_callback("failed", self.on_failed)
 
-            except Exception as e:
-                logger.error(str(e))
+    def on_state_changed(self, event_data):
+        bpy.app.timers.register(partial(self._state_changed, event_data), first_interval=0.1)
 
-        bpy.app.timers.register(f, first_interval=0.1)
+    def on_progress(self, event_data):
+        bpy.app.timers.register(partial(self._progress, event_data), first_interval=0.1)
 
-    def on_failed(event_data):
-        def f():
-            text = f"on_failed {event_data}"
-            logger.info(text)
+    def on_completed(self, event_data):
+        bpy.app.timers.register(partial(self._completed, event_data), first_interval=0.1)
 
-            _task: Task = event_data["task"]
-            result: TaskResult = event_data["result"]
-            try:
-                edit_history = get_history_by_task_id(task_id)
-                edit_history.running_state = "failed"
-
-                if not result.success:
-                    if isinstance(result.error, RuntimeError):
-                        ...
-                        # 超时了
-                    else:
-                        edit_history.running_message = str(result.error)
-                        logger.info(edit_history.running_message)
-                else:
-                    edit_history.running_message = "Unknown error" + " " + str(result.data)
-                edit_history.stop_running()
-            except Exception as e:
-                logger.error(str(e))
-            bpy.context.scene.blender_ai_studio_property.check_all_failed(True)
+    def on_failed(self, event_data):
+        bpy.app.timers.register(partial(self._failed, event_data), first_interval=0.1)
+
+    def _state_changed(self, event_data):
+        edit_history = get_history_by_task_id(self.task_id)
+        old_state: "TaskState" = event_data["old_state"]
+        new_state: "TaskState" = event_data["new_state"]
+        text = f"状态改变: {old_state.value} -> {new_state.value}"
+        logger.info(text)
+        try:
+            edit_history.running_state = new_state.value
+        except Exception as e:
+            logger.error(str(e))
 
-        bpy.app.timers.register(f, first_interval=0.1)
+    def _progress(self, event_data):
+        # {
+        #     "current_step": 2,
+        #     "total_steps": 4,
+        #     "percentage": 0.5,
+        #     "message": "正在调用 API...",
+        #     "details": {},
+        # }
+        progress: dict = event_data["progress"]
+        percent = progress["percentage"]
+        message = progress["message"]
+        if self._progress_label is None:
+            self._progress_label = bpy.app.translations.pgettext("Progress")
+        text = f"{self._progress_label}: {percent * 100}% - {message}"
+        edit_history = get_history_by_task_id(self.task_id)
 
-    task.register_callback("state_changed", on_state_changed)
-    task.register_callback("progress_updated", on_progress)
-    task.register_callback("completed", on_completed)
-    task.register_callback("failed", on_failed)
+        try:
+            edit_history.running_progress = percent
+            edit_history.running_message = text
+        except Exception as e:
+            logger.error(str(e))
+        logger.info(text)
+
+    def _completed(self, event_data):
+        # result_data = {
+        #     "image_data": b"",
+        #     "mime_type": "image/png",
+        #     "width": 1024,
+        #     "height": 1024,
+        # }
+        edit_history = get_history_by_task_id(self.task_id)
+
+        _task: "Task" = event_data["task"]
+        result: "TaskResult" = event_data["result"]
+        results: list[tuple[str, str | bytes]] = result.data
+        if not results:
+            logger.warning("No results")
+            return
+
+        # 存储结果
+        result_data = results[0]
+        ext = mimetypes.guess_extension(result_data[0])
+        save_file = Path(self.temp_folder).joinpath(f"{self.generate_image_name}_Output{ext}")
+        save_file.write_bytes(result_data[1])
+        text = f"任务完成: {_task.task_id} {save_file}"
+        logger.info(text)
+
+        try:
+            edit_history.stop_running()
+            edit_history.running_state = "completed"
+            edit_history.running_message = "Running completed"
+
+            origin_image = edit_history.origin_image
+
+            if gi := bpy.data.images.load(str(save_file), check_existing=False):
+                try:
+                    gi.preview_ensure()
+                    gi.name = self.generate_image_name
+
+                    gi.blender_ai_studio_property.origin_image = origin_image
+                    origin_image.blender_ai_studio_property.add_generated_image(gi)  # 处理多张图片
+
+                    space_data_list = find_ai_image_editor_space_data()  # 将图片加载到图片编辑器中
+                    for space_data in space_data_list:
+                        setattr(space_data, "image", gi)
+
+                    edit_history.add_generated_image(gi)
+                except Exception as e:
+                    print("生成完成设置生成图像到活动项错误 error", e)
+                    import traceback
+                    traceback.print_exc()
+                    traceback.print_stack()
+            else:
+                ut = bpy.app.translations.pgettext("Unable to load generated image!")
+                edit_history.running_message = ut + " " + str(save_file)
+
+        except Exception as e:
+            logger.error(str(e))
+
+    def _failed(self, event_data):
+        text = f"on_failed {event_data}"
+        logger.info(text)
+
+        result: "TaskResult" = event_data["result"]
+        try:
+            edit_history = get_history_by_task_id(self.task_id)
+            edit_history.running_state = "failed"
+
+            if not result.success:
+                if isinstance(result.error, RuntimeError):
+                    ...
+                    # 超时了
+                else:
+                    edit_history.running_message = str(result.error)
+                    logger.info(edit_history.running_message)
+            else:
+                edit_history.running_message = "Unknown error" + " " + str(result.data)
+            edit_history.stop_running()
+        except Exception as e:
+            logger.error(str(e))
+        bpy.context.scene.blender_ai_studio_property.check_all_failed(True)
 
 
 class ApplyAiEditImage(bpy.types.Operator):
@@ -403,7 +414,7 @@ class ApplyAiEditImage(bpy.types.Operator):
 
         edit_history.running_message = "Start..."
         edit_history.task_id = task.task_id
-        add_callback(task, temp_folder, generate_image_name)
+        _EditSession(task.task_id, temp_folder, generate_image_name).register(task)
         TaskManager.get_instance().submit_task(task)
         logger.info(f"任务提交: {task.task_id}")
 
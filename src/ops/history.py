@@ -95,7 +95,8 @@ class OpenImageInNewWindow(bpy.types.Operator):
             last_window = bpy.context.window_manager.windows[-1]
             last_window.screen.areas[0].type = "IMAGE_EDITOR"
             context.window_manager.modal_handler_add(self)
-            context.window_manager.event_timer_add(1 / 60, window=context.window)
+            # 新窗口初始化需要时间, 只在计时器事件时检查, 不在每个事件上都执行
+            self._timer = context.window_manager.event_timer_add(0.1, window=context.window)
             return {"RUNNING_MODAL", "PASS_THROUGH"}
 
     def load_data(self, context):
@@ -122,7 +123,12 @@ class OpenImageInNewWindow(bpy.types.Operator):
             print("load_data error", self.data)
 
     def modal(self, context, event):
-        return self.execute(context)
+        if event.type != "TIMER":
+            return {"PASS_THROUGH"}
+        result = self.execute(context)
+        if "RUNNING_MODAL" not in result:
+            context.window_manager.event_timer_remove(self._timer)
+        return result
 
     def execute(self, context):
         try:
@@ -149,9 +155,8 @@ class OpenImageInNewWindow(bpy.types.Operator):
                                         return {"CANCELLED"}
                                     return {"RUNNING_MODAL"}
                                 region.active_panel_category = "AIStudio"  # 设置活动面板
-                                # with context.temp_override(window=image_window, area=area, region=region):
-                                #     bpy.ops.image.view_all(**{"fit_view": True})
-                                #     bpy.ops.image.view_all(fit_view=True)
+                                # 不调用 bpy.ops.image.view_all 适配视图: 需要对新窗口做上下文覆盖,
+                                # 而 SpaceImageEditor.zoom 是只读的, 无法直接设置
                                 return {"FINISHED"}
                 self.report({"ERROR"}, "No image area")
         except Exception as e:
@@ -6,7 +6,7 @@ from bpy_extras.io_utils import ImportHelper
 
 from .. import logger
 from ..i18n.translations.zh_HANS import OPS_TCTX
-from ..utils import png_name_suffix, refresh_image_preview, get_temp_folder
+from ..utils import png_name_suffix, get_temp_folder
 
 
 def add_reference_image(context, image, image_name=False):
@@ -16,7 +16,8 @@ def add_reference_image(context, image, image_name=False):
     ri.name = png_name_suffix(image.name, "_reference")
     if image_name:
         image.name = ri.name
-    refresh_image_preview(image)
+    if not image.preview:  # 已有预览时不需要重新加载
+        image.preview_ensure()
 
 
 class SelectReferenceImageByFile(bpy.types.Operator, ImportHelper):
@@ -46,7 +47,7 @@ class SelectReferenceImageByFile(bpy.types.Operator, ImportHelper):
     def execute(self, context):
         for file in self.files:
             img_path = Path(self.directory).joinpath(file.name).as_posix()
-            image = bpy.data.images.load(img_path)
+            image = bpy.data.images.load(img_path, check_existing=True)  # 重复选择同一文件时复用已加载的图片
             add_reference_image(context, image)
         return {"FINISHED"}
 
@@ -79,8 +80,9 @@ class SelectReferenceImageByImage(bpy.types.Operator):
         layout = self.layout
         layout.prop(self, "icon_scale")
         count = 0
+        reference_pointers = ai.reference_image_pointers
         for i in bpy.data.images:
-            if i not in ai.all_references_images and not i.blender_ai_studio_property.is_mask_image:
+            if i.as_pointer() not in reference_pointers and not i.blender_ai_studio_property.is_mask_image:
                 if i.preview:
                     box = layout.box()
                     row = box.row()
@@ -125,8 +127,9 @@ class ReplaceReferenceImage(bpy.types.Operator):
         ai = context.scene.blender_ai_studio_property
         layout = self.layout
         layout.prop(self, "icon_scale")
+        reference_pointers = ai.reference_image_pointers
         for i in bpy.data.images:
-            if i not in ai.all_references_images and not i.blender_ai_studio_property.is_mask_image:
+            if i.as_pointer() not in reference_pointers and not i.blender_ai_studio_property.is_mask_image:
                 if i.preview:
                     box = layout.box()
                     row = box.row()
@@ -583,6 +583,11 @@ class SceneProperty(bpy.types.PropertyGroup, GeneralProperty, DynamicEnumeration
     def all_references_images(self) -> list[bpy.types.Image]:
         return [i.image for i in self.reference_images if i.image]
 
+    @property
+    def reference_image_pointers(self) -> frozenset[int]:
+        """参考图片的指针集合, 用于在遍历 bpy.data.images 时做O(1)的成员判断"""
+        return frozenset(i.image.as_pointer() for i in self.reference_images if i.image)
+
     @property
     def active_mask(self) -> bpy.types.Image | None:
         """
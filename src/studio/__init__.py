@@ -17,3 +17,6 @@ def register():
 
 def unregister():
     unreg()
+    from .providers import UniversalProvider
+
+    UniversalProvider.close_session()
@@ -1,13 +1,13 @@
-import base64
+import json
 import time
 import uuid
 from dataclasses import dataclass, field
 from enum import Enum
-from pathlib import Path
 from threading import Thread, Lock
 from typing import TYPE_CHECKING, Callable, Optional
 
 from .network import get_session
+from ...utils import file_to_base64
 from ..exception import (
     APIRequestException,
     AuthFailedException,
@@ -25,6 +25,18 @@ except ImportError:
     import logging
     logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps_body(payload: dict) -> bytes:
+    """序列化请求体, 图片 base64 只复制一次; 没有 orjson 时回退到标准库"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"), allow_nan=False).encode("ascii")
+
 
 class CTalkState(Enum):
     PENDING = "PENDING"
@@ -128,7 +140,8 @@ class CTalkApiClient:
             payload["prompt"] = prompt
 
         session = get_session()
-        resp = session.post(url, headers=self._build_headers(), json=payload, timeout=30)
+        # 直接发送 bytes, 避免 requests 的 json= 先生成 str 再编码一次
+        resp = session.post(url, headers=self._build_headers(), data=_dumps_body(payload), timeout=30)
         resp.raise_for_status()
 
         resp_json: dict = resp.json()
@@ -309,8 +322,8 @@ class PromptReverseManager:
 
     @staticmethod
     def _encode_image(image_path: str) -> str:
-        data = Path(image_path).read_bytes()
-        return base64.b64encode(data).decode("utf-8")
+        # 与请求构建共用同一个编码器和有上限的缓存, 文件被修改后 (mtime/size 变化) 自动失效
+        return file_to_base64(image_path)
 
 
 # ==================== 合批轮询器 ====================
@@ -2,6 +2,7 @@ import json
 import platform
 import time
 import traceback
+from datetime import datetime
 from pathlib import Path
 from threading import Thread
 from typing import Optional
@@ -43,6 +44,9 @@ class StudioHistoryItem:
         self.created_at: float = 0.0
         self.started_at: float = 0.0
         self.finished_at: float = 0.0
+        # 详情面板每帧都显示创建时间, 时间戳不变时复用格式化结果
+        self._timestamp_key: float | None = None
+        self._timestamp_str: str = ""
 
     def stringify(self) -> str:
         """序列化"""
@@ -157,6 +161,12 @@ class StudioHistoryItem:
             prompt = self.metadata["params"].get("prompt", "")  # 新格式
         return prompt
 
+    def get_timestamp_str(self) -> str:
+        if self._timestamp_key != self.timestamp:
+            self._timestamp_key = self.timestamp
+            self._timestamp_str = datetime.fromtimestamp(self.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        return self._timestamp_str
+
     def get_auth_mode(self):
         return self.metadata.get("auth_mode", "")
 
@@ -191,8 +201,12 @@ class StudioHistory:
         return cls._INSTANCE
 
     def __init__(self):
+        # __new__ 返回已有实例时 __init__ 仍会被调用, 避免清空已有历史
+        if hasattr(self, "_initialized") and self._initialized:
+            return
         self.items: list[StudioHistoryItem] = []
         self.current_index = 0
+        self._initialized = True
 
     def add_fake_items(self):
         self.add_fake_item().status = StudioHistoryItem.STATUS_PENDING
@@ -1,9 +1,10 @@
 import bpy
 import time
+from itertools import chain
 from traceback import print_exc
 from bpy.app.translations import pgettext_iface as _T
 from pathlib import Path
-from typing import Iterable, Dict, Any, List
+from typing import Iterable, Dict, Any
 from uuid import uuid4
 
 from .base import StudioClient, StudioHistoryItem
@@ -11,6 +12,7 @@ from .progress_estimator import TaskProgressEstimator
 from ..account import Account
 from ..common import PromptOption
 from ..config.model_registry import ModelConfig, ModelRegistry
+from ..ops import FileCallbackRegistry
 from ..tasks import (
     UniversalModelTask,
     Task,
@@ -46,6 +48,34 @@ class UniversalClient(StudioClient):
     DEFAULT_MODEL_ID = "gemini-3-pro-image-preview"
     DEFAULT_MODEL_NAME = "NanoBananaPro"
 
+    # 额外参数(不会传递给模型,用于UI显示), 所有实例共享
+    EXTRA_PARAMS = (
+        # 1. 批量渲染 任务数(整数, [1, 8])
+        {
+            "name": "batch_count",
+            "display_name": "Batch Count",
+            "type": "INT",
+            "hide_title": True,
+            "default": 1,
+            "min": 1,
+            "max": 16,
+            "step": 1,
+        },
+    )
+    # 参数定义中存在时才复制到 meta 的可选字段
+    OPTIONAL_META_KEYS = (
+        "multiline",
+        "resizable",
+        "default",
+        "options",
+        "limit",
+        "min",
+        "max",
+        "step",
+        "visible_when",
+        "processor",
+    )
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
 
@@ -57,22 +87,6 @@ class UniversalClient(StudioClient):
 
         self._meta_cache: Dict[str, Dict[str, Any]] = {}
 
-        # 额外参数(不会传递给模型,用于UI显示)
-        self._extra_params: List[Dict[str, Any]] = []
-        # 1. 批量渲染 任务数(整数, [1, 8])
-        self._extra_params.append(
-            {
-                "name": "batch_count",
-                "display_name": "Batch Count",
-                "type": "INT",
-                "hide_title": True,
-                "default": 1,
-                "min": 1,
-                "max": 16,
-                "step": 1,
-            }
-        )
-
         # 当前选择的模型 ID
         self._current_model_name = self.DEFAULT_MODEL_NAME
         # 用于手动设置模型 ID
@@ -172,7 +186,7 @@ class UniversalClient(StudioClient):
         params = {}
         if not self._model_config:
             return params
-        for pdef in self._model_config.parameters + self._extra_params:
+        for pdef in chain(self._model_config.parameters, self.EXTRA_PARAMS):
             pname = pdef.get("name")
             if not pname:
                 continue
@@ -227,42 +241,23 @@ class UniversalClient(StudioClient):
             params = self._model_config.parameters
 
         # 从 ModelConfig 加载所有参数
-        for param in params + self._extra_params:
+        for param in chain(params, self.EXTRA_PARAMS):
             param_name = param.get("name")
             if not param_name:
                 continue
 
             # 复制参数定义
-            meta[param_name] = {
+            param_meta = meta[param_name] = {
                 "display_name": param.get("display_name", param_name),
                 "category": param.get("category", "Input"),
                 "type": param.get("type", "STRING"),
                 "hide_title": param.get("hide_title", False),
             }
 
-            # 可选字段
-            if "multiline" in param:
-                meta[param_name]["multiline"] = param["multiline"]
-            if "resizable" in param:
-                meta[param_name]["resizable"] = param["resizable"]
-            if "default" in param:
-                meta[param_name]["default"] = param["default"]
-            if "options" in param:
-                meta[param_name]["options"] = param["options"]
-            if "limit" in param:
-                meta[param_name]["limit"] = param["limit"]
-            if "min" in param:
-                meta[param_name]["min"] = param["min"]
-            if "max" in param:
-                meta[param_name]["max"] = param["max"]
-            if "step" in param:
-                meta[param_name]["step"] = param["step"]
-
-            # ✅ 新增：visible_when 和 processor 字段
-            if "visible_when" in param:
-                meta[param_name]["visible_when"] = param["visible_when"]
-            if "processor" in param:
-                meta[param_name]["processor"] = param["processor"]
+            # 可选字段(含 visible_when 和 processor)
+            for key in self.OPTIONAL_META_KEYS:
+                if key in param:
+                    param_meta[key] = param[key]
 
         return meta
 
@@ -631,8 +626,6 @@ def upload_image(client: StudioClient, prop: str):
                 l.append(file_path)
         clamp_client_image_count(client, prop)
 
-    from ..ops import FileCallbackRegistry
-
     callback_id = FileCallbackRegistry.register_callback(upload_image_callback)
     if not callback_id:
         client.push_error(_T("File Select Window is Busy, Close it First!"))
@@ -649,8 +642,6 @@ def replace_image(client: StudioClient, prop: str, index: int = -1):
             except IndexError:
                 client.get_value(prop).append(file_path)
 
-    from ..ops import FileCallbackRegistry
-
     callback_id = FileCallbackRegistry.register_callback(replace_image_callback)
     if not callback_id:
         client.push_error(_T("File Select Window is Busy, Close it First!"))
@@ -210,7 +210,11 @@ class AnimationSystem:
         return cls._INSTANCE
 
     def __init__(self) -> None:
+        # __new__ 返回已有实例时 __init__ 仍会被调用, 避免丢弃正在播放的动画
+        if hasattr(self, "_initialized") and self._initialized:
+            return
         self.active_anims: List[Animatable] = []
+        self._initialized = True
 
     def add(self, anim: A) -> A:
         """注册一个动画到系统"""
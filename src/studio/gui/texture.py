@@ -7,24 +7,30 @@ from pathlib import Path
 
 ICON_PATH = Path(__file__).parent.joinpath("icons")
 NONE_ICON_PATH = ICON_PATH.joinpath("none.png")
+# 列表中缩略图的最长边, 单元格约 150px, 留出高分屏余量
+THUMBNAIL_SIZE = 256
 
 
 class TexturePool:
     TEXTURE_MAP: dict[str, gpu.types.GPUTexture] = {}
     TEXTURE_ID_MAP: dict[int, gpu.types.GPUTexture] = {}
     ANIMATED_TEXTURE_PLAYERS: dict[int, "AnimatedPlayer"] = {}
+    # 缩小后的纹理, 参考图等只以小尺寸显示的图片不再整张上传到显存
+    THUMBNAIL_MAP: dict[str, gpu.types.GPUTexture] = {}
+    # (img, 是否缩略图) -> (tex_id, 宽占比, 高占比), 纹理替换时失效
+    TEXTURE_ASPECT_MAP: dict[tuple[str, bool], tuple[int, float, float]] = {}
 
     @staticmethod
-    def read_image_to_tex(file_path):
+    def read_image_to_tex(file_path, max_size: int = 0):
         try:
-            return TexturePool.try_laod_image_to_tex(file_path)
+            return TexturePool.try_laod_image_to_tex(file_path, max_size)
         except Exception as e:
             print(f"Failed to load texture: {file_path}")
             print(e)
             return TexturePool.try_laod_image_to_tex(NONE_ICON_PATH)
 
     @staticmethod
-    def try_laod_image_to_tex(file_path):
+    def try_laod_image_to_tex(file_path, max_size: int = 0):
         file_path = Path(file_path)
         if not file_path.exists():
             file_path = ICON_PATH.joinpath(f"{file_path}.png")
@@ -40,6 +46,13 @@ class TexturePool:
             gpu_tex = gpu.types.GPUTexture(gpu_buf.dimensions[:2], format="RGBA8", data=gpu_buf)
             return gpu_tex
         spec = buf.spec()
+        longest = max(spec.width, spec.height)
+        if max_size and longest > max_size:
+            # 在 CPU 上缩小后再上传, 4K 照片只占缩略图大小的显存
+            w = max(1, round(spec.width * max_size / longest))
+            h = max(1, round(spec.height * max_size / longest))
+            buf = oiio.ImageBufAlgo.resize(buf, roi=oiio.ROI(0, w, 0, h, 0, 1, 0, spec.nchannels))
+            spec = buf.spec()
         pixels = buf.get_pixels(oiio.FLOAT)
         gpu_buf = gpu.types.Buffer("FLOAT", (spec.width, spec.height, spec.nchannels), pixels)
         tex_format_map = {
@@ -63,9 +76,20 @@ class TexturePool:
 
     @classmethod
     def get_tex_id(cls, img) -> int:
-        if img not in cls.TEXTURE_MAP:
-            cls.TEXTURE_MAP[img] = cls.read_image_to_tex(img)
-        gpu_tex = cls.TEXTURE_MAP[img]
+        # 图标名每帧都会查询, 命中时只查一次表
+        gpu_tex = cls.TEXTURE_MAP.get(img)
+        if gpu_tex is None:
+            gpu_tex = cls.TEXTURE_MAP[img] = cls.read_image_to_tex(img)
+        gpu_tex_id = id(gpu_tex)
+        cls.TEXTURE_ID_MAP[gpu_tex_id] = gpu_tex
+        return gpu_tex_id
+
+    @classmethod
+    def get_thumbnail_tex_id(cls, img) -> int:
+        """最长边不超过 THUMBNAIL_SIZE 的纹理, 原图需要时仍通过 get_tex_id 获取"""
+        gpu_tex = cls.THUMBNAIL_MAP.get(img)
+        if gpu_tex is None:
+            gpu_tex = cls.THUMBNAIL_MAP[img] = cls.read_image_to_tex(img, THUMBNAIL_SIZE)
         gpu_tex_id = id(gpu_tex)
         cls.TEXTURE_ID_MAP[gpu_tex_id] = gpu_tex
         return gpu_tex_id
@@ -78,6 +102,7 @@ class TexturePool:
         gpu_tex = player.get_frame(time)
 
         cls.TEXTURE_MAP[img] = gpu_tex
+        cls.TEXTURE_ASPECT_MAP.pop((img, False), None)
         gpu_tex_id = id(gpu_tex)
         cls.TEXTURE_ID_MAP[gpu_tex_id] = gpu_tex
 
@@ -88,6 +113,25 @@ class TexturePool:
     def get_tex(cls, tex_id) -> gpu.types.GPUTexture | None:
         return cls.TEXTURE_ID_MAP.get(tex_id, None)
 
+    @classmethod
+    def get_tex_aspect(cls, img, thumbnail: bool = False) -> tuple[int, float, float]:
+        """返回 (tex_id, 宽占比, 高占比), 占比为宽高除以较长边
+
+        图片列表每帧都要按纹理比例绘制, 结果缓存到纹理被替换为止
+        """
+        key = img, thumbnail
+        entry = cls.TEXTURE_ASPECT_MAP.get(key)
+        if entry is None:
+            tex_id = cls.get_thumbnail_tex_id(img) if thumbnail else cls.get_tex_id(img)
+            tex = cls.get_tex(tex_id)
+            if tex:
+                m = max(tex.width, tex.height) or 1
+                entry = tex_id, tex.width / m, tex.height / m
+            else:
+                entry = tex_id, 1, 1
+            cls.TEXTURE_ASPECT_MAP[key] = entry
+        return entry
+
 
 class AnimatedPlayer:
     """
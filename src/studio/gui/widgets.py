@@ -2,10 +2,12 @@ import bpy
 import gpu
 import numpy as np
 from contextlib import contextmanager
+from functools import lru_cache
 from traceback import print_exc
 from typing import Optional
 from .texture import TexturePool
 from .app.renderer import imgui
+from .app.style import Const
 
 DEFAULT_CHILD_FLAGS = 0
 DEFAULT_CHILD_FLAGS |= imgui.ChildFlags.FRAME_STYLE
@@ -25,6 +27,30 @@ def with_child(str_id: str, size: tuple[float, float] = (0.0, 0.0), child_flags:
     imgui.end_child()
 
 
+@lru_cache(maxsize=64)
+def color_u32(col: tuple) -> int:
+    """常量颜色的 u32 缓存; 界面内不修改 style.alpha, 相同颜色的结果不变"""
+    return imgui.get_color_u32(col)
+
+
+class _TransparentButton:
+    """按钮三种状态颜色全部透明, 无状态, 各处共用同一个实例"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        push_style_color = imgui.push_style_color
+        push_style_color(imgui.Col.BUTTON, Const.TRANSPARENT)
+        push_style_color(imgui.Col.BUTTON_HOVERED, Const.TRANSPARENT)
+        push_style_color(imgui.Col.BUTTON_ACTIVE, Const.TRANSPARENT)
+
+    def __exit__(self, exc_type, exc, tb):
+        imgui.pop_style_color(3)
+
+
+transparent_button = _TransparentButton()
+
+
 class CustomWidgets:
     @staticmethod
     def make_texture_bpy():
@@ -1,22 +1,37 @@
+import importlib
+
 from .base import RequestBuilder, RequestData
 from .registry import BuilderRegistry
-from .gemini_builder import GeminiImageGenerateBuilder
-from .seedream_builder import SeedreamImageGenerateBuilder
-from .gpt_image_builder import GPTImageGenerateBuilder
 from .api_builder import APIBuilder
 
+# 图像构建器依赖较多(提示词/图像处理), 第一次使用时才导入
+_LAZY_BUILDERS = {
+    "GeminiImageGenerateBuilder": ".gemini_builder:GeminiImageGenerateBuilder",
+    "GeminiImageGenerateBuilderPro": ".gemini_builder:GeminiImageGenerateBuilderPro",
+    "SeedreamImageGenerateBuilder": ".seedream_builder:SeedreamImageGenerateBuilder",
+    "GPTImageGenerateBuilder": ".gpt_image_builder:GPTImageGenerateBuilder",
+}
+
+
 # 自动注册所有构建器
-BuilderRegistry.register("GeminiImageGenerateBuilder", GeminiImageGenerateBuilder)
-BuilderRegistry.register("GeminiImageGenerateBuilderPro", lambda: GeminiImageGenerateBuilder(is_pro=True))
-BuilderRegistry.register("SeedreamImageGenerateBuilder", SeedreamImageGenerateBuilder)
-BuilderRegistry.register("GPTImageGenerateBuilder", GPTImageGenerateBuilder)
+for _name, _path in _LAZY_BUILDERS.items():
+    BuilderRegistry.register(_name, lazy=_path)
 BuilderRegistry.register("APIBuilder", APIBuilder)
 
+
+def __getattr__(name: str):
+    if name in _LAZY_BUILDERS:
+        module_name, _, class_name = _LAZY_BUILDERS[name].partition(":")
+        return getattr(importlib.import_module(module_name, __name__), class_name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     "RequestBuilder",
     "RequestData",
     "BuilderRegistry",
     "GeminiImageGenerateBuilder",
+    "GeminiImageGenerateBuilderPro",
     "SeedreamImageGenerateBuilder",
     "GPTImageGenerateBuilder",
     "APIBuilder",
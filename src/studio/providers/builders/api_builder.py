@@ -24,9 +24,7 @@ class APIBuilder(RequestBuilder):
 
         # 验证功能支持
         if not model_config.supports_action(action):
-            error_msg: str = _T("Action '{action}' not supported for model 'API'.") or ""
-            error_msg = error_msg.format(action=action, model_name=model_config.model_name)
-            raise ValueError(error_msg)
+            raise ValueError(_T("Action '{action}' not supported for model 'API'.").format(action=action, model_name=model_config.model_name))
 
         # 构建 URL
         url = model_config.build_api_url(auth_mode)
@@ -57,28 +55,12 @@ class APIBuilder(RequestBuilder):
         - {reqId}: 请求 ID
         - {taskType}: 任务类型
         """
-        headers: dict[str, str] = {}
-
-        for key, value in header_template.items():
-            if isinstance(value, str) and "{" in value:
-                # 替换认证凭证占位符
-                for cred_key, cred_value in credentials.items():
-                    value = value.replace(f"{{{cred_key}}}", cred_value)
-            headers[key] = value
-
-        return headers
+        return self._render_headers(header_template, credentials)
 
     def _build_files(self, params: dict[str, Any]) -> list[dict[str, Any]]:
         ref_images_path = params.get("reference_images", [])
 
-        # 20MB
-        total_image_size_limit = 20 * 1024 * 1024
-        total_image_size = 0
-
-        for _image_path in ref_images_path:
-            total_image_size += Path(_image_path).stat().st_size
-        if total_image_size > total_image_size_limit:
-            raise ValueError("Total image size exceeds the limit of 20MB.")
+        self._check_total_image_size(ref_images_path)
 
         files = []
         for reference_image_path in ref_images_path:
@@ -1,11 +1,45 @@
+import json
+import os
+import re
 from abc import ABC, abstractmethod
-from typing import Dict, Any, TYPE_CHECKING, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, TYPE_CHECKING, Callable, List, Optional, Tuple, TypeVar
 from dataclasses import dataclass, field
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 if TYPE_CHECKING:
     from ...config.model_registry import ModelConfig
 
 
+# 单次请求所有输入图片的总大小限制 20MB
+TOTAL_IMAGE_SIZE_LIMIT = 20 * 1024 * 1024
+
+# 并发读取/编码输入图片的最大线程数
+MAX_ENCODE_WORKERS = 8
+
+_Encoded = TypeVar("_Encoded")
+
+# Header 模板中的占位符, 如 {token} {modelId} {size}
+_HEADER_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+# (key, value, 占位符名称)
+CompiledHeaders = Tuple[Tuple[str, Any, Tuple[str, ...]], ...]
+
+# id(模板) -> (模板, 预处理结果), 保存模板引用避免 id 被复用
+_compiled_header_templates: Dict[int, Tuple[Dict[str, Any], CompiledHeaders]] = {}
+
+
+class _HeaderValues(dict):
+    """format_map 使用的占位符取值, 没有提供的占位符原样保留"""
+
+    def __missing__(self, key: str) -> str:
+        return f"{{{key}}}"
+
+
 @dataclass
 class RequestData:
     """HTTP 请求数据"""
@@ -18,6 +52,18 @@ class RequestData:
     query_params: Dict[str, str] = field(default_factory=dict)
     timeout: int = 80
 
+    def body_bytes(self) -> bytes:
+        """序列化 payload 为请求体
+
+        payload 中包含大量 base64 字符串, 安装了 orjson 时使用 orjson 序列化,
+        否则使用标准库 json(去掉多余空白)。
+        接口只接受 JSON(inline_data), 图片无法以二进制分段上传, 因此只在序列化上减少开销。
+        """
+        if orjson is not None:
+            return orjson.dumps(self.payload)
+        # ensure_ascii 保证输出只含 ASCII, 按 ascii 编码可直接复制而无需逐字符转换
+        return json.dumps(self.payload, separators=(",", ":"), allow_nan=False).encode("ascii")
+
 
 class RequestBuilder(ABC):
     """请求构建器抽象基类
@@ -44,3 +90,53 @@ class RequestBuilder(ABC):
             ValueError: 参数不合法
         """
         pass
+
+    @staticmethod
+    def _compile_header_template(header_template: Dict[str, Any]) -> CompiledHeaders:
+        """预处理 Header 模板
+
+        模板来自 ModelConfig, 对同一个模型是固定的, 只在第一次使用时扫描占位符,
+        之后每次请求只替换实际存在的占位符。
+        """
+        cached = _compiled_header_templates.get(id(header_template))
+        if cached is not None and cached[0] is header_template:
+            return cached[1]
+        compiled = tuple(
+            (key, value, tuple(_HEADER_PLACEHOLDER.findall(value)) if isinstance(value, str) else ())
+            for key, value in header_template.items()
+        )
+        _compiled_header_templates[id(header_template)] = (header_template, compiled)
+        return compiled
+
+    def _render_headers(self, header_template: Dict[str, Any], values: Dict[str, str]) -> Dict[str, str]:
+        """用 values 填充 Header 模板中的占位符, 每个模板值只扫描一次"""
+        values = _HeaderValues(values)
+        return {
+            key: value.format_map(values) if placeholders else value
+            for key, value, placeholders in self._compile_header_template(header_template)
+        }
+
+    @staticmethod
+    def _encode_images(encode: Callable[[str], _Encoded], image_paths: List[str]) -> List[_Encoded]:
+        """并发读取并编码多张图片, 结果顺序与 image_paths 一致
+
+        读文件和 base64 编码都会释放 GIL, 多张参考图时耗时接近最慢的一张而不是总和。
+        """
+        if len(image_paths) <= 1:
+            return [encode(path) for path in image_paths]
+        with ThreadPoolExecutor(max_workers=min(MAX_ENCODE_WORKERS, len(image_paths))) as executor:
+            return list(executor.map(encode, image_paths))
+
+    @staticmethod
+    def _check_total_image_size(image_paths, limit: int = TOTAL_IMAGE_SIZE_LIMIT) -> None:
+        """检查输入图片总大小, 超过限制时立即抛出 ValueError
+
+        空路径(如没有遮罩)会被跳过; 重复的路径每次都会被编码进请求, 按出现次数统计。
+        """
+        total_image_size = 0
+        for path in image_paths:
+            if not path:
+                continue
+            total_image_size += os.stat(path).st_size
+            if total_image_size > limit:
+                raise ValueError(f"Total image size exceeds the limit of {limit // (1024 * 1024)}MB.")
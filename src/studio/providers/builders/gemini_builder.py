@@ -1,5 +1,5 @@
-from copy import deepcopy
-from pathlib import Path
+from bisect import bisect_right
+from functools import lru_cache
 from typing import Dict, Any, TYPE_CHECKING
 
 import bpy
@@ -17,13 +17,78 @@ from .gemini_prompt import (
     EDIT_WITH_REFERENCES,
     EDIT_BASE_PROMPT,
 )
-from .... import logger
 from ....utils import calc_appropriate_aspect_ratio, image_file_to_base64, get_pref
 
 if TYPE_CHECKING:
     from ...config.model_registry import ModelConfig
 
 
+# 分辨率选项 -> 输出宽高
+_RESOLUTION_SIZES = {
+    "0.5K": (512, 512),
+    "1K": (1024, 1024),
+    "2K": (2048, 2048),
+    "4K": (4096, 4096),
+}
+
+# 长边下限 -> API 的 imageSize, 小于 512 时默认 1K
+_IMAGE_SIZE_BOUNDS = (512, 1024, 2048, 4096)
+_IMAGE_SIZE_LABELS = ("1K", "512", "1K", "2K", "4K")
+
+
+def _classify_image_size(width: int, height: int) -> str:
+    return _IMAGE_SIZE_LABELS[bisect_right(_IMAGE_SIZE_BOUNDS, max(width, height))]
+
+
+@lru_cache(maxsize=32)
+def _resolution_bits(width: int, height: int) -> tuple[str, str]:
+    """(控制输出分辨率的提示词后缀, imageSize), 宽高只有少量组合, 按尺寸缓存"""
+    suffix = f"\n\nCRITICAL OUTPUT SETTING: Generate image EXACTLY at {width}x{height} pixels."
+    return suffix, _classify_image_size(width, height)
+
+
+# (有遮罩, 有参考图片) -> 编辑基础提示词
+_EDIT_PROMPTS = {
+    (True, True): EDIT_WITH_MASK_AND_REFERENCES,
+    (True, False): EDIT_WITH_MASK,
+    (False, True): EDIT_WITH_REFERENCES,
+    (False, False): EDIT_BASE_PROMPT,  # 只有提示词输入的基本提示词
+}
+
+# (彩色渲染, 有参考图片) -> 生成基础提示词
+_GENERATE_PROMPTS = {
+    (True, True): GENERATE_RENDER_WITH_REFERENCE,
+    (True, False): GENERATE_RENDER_WITHOUT_REFERENCE,
+    (False, True): GENERATE_DEPTH_MAP_WITHOUT_REFERENCE,
+    (False, False): GENERATE_DEPTH_MAP_WITH_REFERENCE,
+}
+
+
+@lru_cache(maxsize=128)
+def _compose_edit_prompt(user_prompt: str, has_mask: bool, has_reference: bool) -> str:
+    """系统提示词 + 用户提示词
+    只依赖参数, 重复使用同一提示词(生成 -> 智能修复 -> 重新渲染)时直接返回缓存
+    """
+    if user_prompt == "[智能修复]":  # 智能修复的提示词
+        return EDIT_SMART_REPAIR
+
+    base_prompt = _EDIT_PROMPTS[has_mask, has_reference]
+    # 有遮罩和参考图片时不附加用户提示词
+    if has_mask and has_reference:
+        return base_prompt
+    if user_prompt := user_prompt.strip():
+        return f"{base_prompt}\n\nUSER'S EDIT INSTRUCTIONS:\n{user_prompt}"
+    return base_prompt
+
+
+@lru_cache(maxsize=128)
+def _compose_generate_prompt(user_prompt: str, has_reference: bool, is_color_render: bool) -> str:
+    base_prompt = _GENERATE_PROMPTS[is_color_render, has_reference]
+    if user_prompt := user_prompt.strip():
+        return f"{base_prompt}\n\nUSER PROMPT (EXECUTE THIS): {user_prompt}"
+    return base_prompt
+
+
 class GeminiImageGenerateBuilder(RequestBuilder):
     """Gemini 图像请求构建器
 
@@ -71,9 +136,7 @@ class GeminiImageGenerateBuilder(RequestBuilder):
 
         # 验证功能支持
         if not model_config.supports_action(action):
-            error_msg: str = _T("Action '{action}' not supported for model '{model_name}'.")
-            error_msg = error_msg.format(action=action, model_name=model_config.model_name)
-            raise ValueError(error_msg)
+            raise ValueError(_T("Action '{action}' not supported for model '{model_name}'.").format(action=action, model_name=model_config.model_name))
 
         # 2. 构建 URL
         url = model_config.build_api_url(auth_mode)
@@ -122,7 +185,7 @@ class GeminiImageGenerateBuilder(RequestBuilder):
         Returns:
             处理后的参数
         """
-        processed = deepcopy(params)
+        processed = params.copy()  # 只修改顶层键, 浅拷贝即可与调用方隔离
 
         # 1. 处理提示词：优先使用 user_prompt，如果没有则使用 prompt
         if "user_prompt" not in processed and "prompt" in processed:
@@ -144,13 +207,7 @@ class GeminiImageGenerateBuilder(RequestBuilder):
         # 3. 处理分辨率：将字符串转换为 width/height
         if "resolution" in processed and ("width" not in processed or "height" not in processed):
             resolution_str = processed["resolution"]
-            resolution_map = {
-                "0.5K": (512, 512),
-                "1K": (1024, 1024),
-                "2K": (2048, 2048),
-                "4K": (4096, 4096),
-            }
-            width, height = resolution_map.get(resolution_str, (1024, 1024))
+            width, height = _RESOLUTION_SIZES.get(resolution_str, (1024, 1024))
             processed["width"] = width
             processed["height"] = height
 
@@ -189,19 +246,8 @@ class GeminiImageGenerateBuilder(RequestBuilder):
         - {modelId}: 模型 ID
         - {size}: 图片尺寸（从 params 中获取）
         """
-        headers = {}
-
-        for key, value in header_template.items():
-            if isinstance(value, str) and "{" in value:
-                # 替换认证凭证占位符
-                for cred_key, cred_value in credentials.items():
-                    value = value.replace(f"{{{cred_key}}}", cred_value)
-                # 特殊占位符替换
-                if "{size}" in value:
-                    value = value.replace("{size}", params.get("resolution", "1K"))
-            headers[key] = value
-
-        return headers
+        # 认证凭证优先, {size} 未在凭证中提供时从 params 中获取
+        return self._render_headers(header_template, {"size": params.get("resolution", "1K"), **credentials})
 
     def _build_generate_payload(self, params: Dict[str, Any]) -> dict:
         """构建图像生成 payload（原 _build_payload 逻辑）"""
@@ -213,14 +259,7 @@ class GeminiImageGenerateBuilder(RequestBuilder):
         height = params.get("height", 1024)
         aspect_ratio = params.get("aspect_ratio", "1:1")
 
-        # 20MB
-        total_image_size_limit = 20 * 1024 * 1024
-        total_image_size = 0
-        all_image_paths = ref_images_path + ([image_path] if image_path else [])
-        for _image_path in all_image_paths:
-            total_image_size += Path(_image_path).stat().st_size
-        if total_image_size > total_image_size_limit:
-            raise ValueError("Total image size exceeds the limit of 20MB.")
+        self._check_total_image_size([*ref_images_path, image_path])
 
         # 构建完整提示词
         full_prompt = self._build_generate_prompt(
@@ -230,28 +269,12 @@ class GeminiImageGenerateBuilder(RequestBuilder):
         )
 
         # 控制输出分辨率
-        full_prompt += f"\n\nCRITICAL OUTPUT SETTING: Generate image EXACTLY at {width}x{height} pixels."
+        resolution_suffix, image_size = _resolution_bits(width, height)
+        full_prompt += resolution_suffix
 
-        parts = [{"text": full_prompt}]
-
-        # Build parts array
-        if image_path:
-            parts.append(image_file_to_base64(image_path))
-
-        # Add reference image (Style) - SECOND image
-        for reference_image_path in ref_images_path:
-            parts.append(image_file_to_base64(reference_image_path))
-
-        # Map resolution to string format expected by API
-        image_size = "1K"
-        if width >= 4096 or height >= 4096:
-            image_size = "4K"
-        elif width >= 2048 or height >= 2048:
-            image_size = "2K"
-        elif width >= 1024 or height >= 1024:
-            image_size = "1K"
-        elif width >= 512 or height >= 512:
-            image_size = "512"
+        # 主图在前, 参考图(风格)在后
+        image_paths = [image_path, *ref_images_path] if image_path else list(ref_images_path)
+        parts = [{"text": full_prompt}, *self._encode_images(image_file_to_base64, image_paths)]
 
         image_config = {}
         if self.is_pro:
@@ -277,15 +300,8 @@ class GeminiImageGenerateBuilder(RequestBuilder):
         image_size = params.get("resolution", "1K")
         aspect_ratio = params.get("aspect_ratio", "1:1")
 
-        # 20MB
-        total_image_size_limit = 20 * 1024 * 1024
-        total_image_size = 0
-        all_image_paths = ref_images_path + ([image_path, ] if image_path else []) + [mask_image_path, ]
-        for i in all_image_paths:
-            total_image_size += Path(i).stat().st_size
-            if total_image_size > total_image_size_limit:
-                logger.warning(f"total_image_size :{total_image_size / 1024 / 1024}MB")
-                raise ValueError("Total image size exceeds the limit of 20MB.")
+        # 遮罩已包含在参考图片中
+        self._check_total_image_size([*ref_images_path, image_path])
 
         prompt = self._build_edit_prompt(
             params,
@@ -293,14 +309,9 @@ class GeminiImageGenerateBuilder(RequestBuilder):
             has_reference=bool(ref_images_path[1:]),
         )
 
-        parts = [{"text": prompt}, image_file_to_base64(image_path)]
-
-        # 遮罩默认在第一张参考图片位置
-        for ref_path in ref_images_path:
-            # mask为空时过滤掉
-            if not ref_path:
-                continue
-            parts.append(image_file_to_base64(ref_path))
+        # 遮罩默认在第一张参考图片位置, mask为空时过滤掉
+        image_paths = [image_path, *(ref_path for ref_path in ref_images_path if ref_path)]
+        parts = [{"text": prompt}, *self._encode_images(image_file_to_base64, image_paths)]
 
         image_config = {}
         if self.is_pro:
@@ -338,24 +349,7 @@ class GeminiImageGenerateBuilder(RequestBuilder):
         if self._should_exclude_system_prompt(params):
             return user_prompt
 
-        if user_prompt == "[智能修复]":  # 智能修复的提示词
-            base_prompt = EDIT_SMART_REPAIR
-            return base_prompt
-
-        if has_mask and has_reference:  # 有遮罩和参考图片
-            base_prompt = EDIT_WITH_MASK_AND_REFERENCES
-            return base_prompt
-        elif has_mask:  # 有遮罩
-            base_prompt = EDIT_WITH_MASK
-        elif has_reference:  # 有参考图片
-            base_prompt = EDIT_WITH_REFERENCES
-        else:
-            # 没有遮罩也没有参考图片,只有提示词输入的基本提示词
-            base_prompt = EDIT_BASE_PROMPT
-        if user_prompt.strip():
-            return f"{base_prompt}\n\nUSER'S EDIT INSTRUCTIONS:\n{user_prompt.strip()}"
-        else:
-            return base_prompt
+        return _compose_edit_prompt(user_prompt, has_mask, has_reference)
 
     def _should_exclude_system_prompt(self, params: Dict[str, Any]) -> bool:
         return params.get("__disable_system_prompt", False) or get_pref().disable_system_prompt
@@ -370,16 +364,11 @@ class GeminiImageGenerateBuilder(RequestBuilder):
         if get_pref().disable_system_prompt:
             return user_prompt
 
-        if is_color_render:
-            if has_reference:
-                base_prompt = GENERATE_RENDER_WITH_REFERENCE
-            else:
-                base_prompt = GENERATE_RENDER_WITHOUT_REFERENCE
-        else:
-            if has_reference:
-                base_prompt = GENERATE_DEPTH_MAP_WITHOUT_REFERENCE
-            else:
-                base_prompt = GENERATE_DEPTH_MAP_WITH_REFERENCE
-        if user_prompt.strip():
-            return f"{base_prompt}\n\nUSER PROMPT (EXECUTE THIS): {user_prompt.strip()}"
-        return base_prompt
+        return _compose_generate_prompt(user_prompt, has_reference, is_color_render)
+
+
+class GeminiImageGenerateBuilderPro(GeminiImageGenerateBuilder):
+    """Gemini Pro 图像请求构建器（支持 imageSize）"""
+
+    def __init__(self):
+        super().__init__(is_pro=True)
@@ -1,5 +1,5 @@
 import os
-from copy import deepcopy
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, TYPE_CHECKING, List, Optional, Tuple
 
@@ -24,6 +24,46 @@ if TYPE_CHECKING:
     from ...config.model_registry import ModelConfig
 
 
+# (有遮罩, 有参考图片) -> 编辑基础提示词
+_EDIT_PROMPTS = {
+    (True, True): EDIT_WITH_MASK_AND_REFERENCES,
+    (True, False): EDIT_WITH_MASK,
+    (False, True): EDIT_WITH_REFERENCES,
+    (False, False): EDIT_BASE_PROMPT,  # 只有提示词输入的基本提示词
+}
+
+# (彩色渲染, 有参考图片) -> 生成基础提示词
+_GENERATE_PROMPTS = {
+    (True, True): GENERATE_RENDER_WITH_REFERENCE,
+    (True, False): GENERATE_RENDER_WITHOUT_REFERENCE,
+    (False, True): GENERATE_DEPTH_MAP_WITH_REFERENCE,
+    (False, False): GENERATE_DEPTH_MAP_WITHOUT_REFERENCE,
+}
+
+
+@lru_cache(maxsize=128)
+def _compose_edit_prompt(user_prompt: str, has_mask: bool, has_reference: bool) -> str:
+    """系统提示词 + 用户提示词, 只依赖参数, 结果可以缓存"""
+    if user_prompt == "[智能修复]":  # 智能修复的提示词
+        return EDIT_SMART_REPAIR
+
+    base_prompt = _EDIT_PROMPTS[has_mask, has_reference]
+    # 有遮罩和参考图片时不附加用户提示词
+    if has_mask and has_reference:
+        return base_prompt
+    if user_prompt := user_prompt.strip():
+        return f"{base_prompt}\n\n用户的编辑说明:\n{user_prompt}"
+    return base_prompt
+
+
+@lru_cache(maxsize=128)
+def _compose_generate_prompt(user_prompt: str, has_reference: bool, is_color_render: bool) -> str:
+    base_prompt = _GENERATE_PROMPTS[is_color_render, has_reference]
+    if user_prompt := user_prompt.strip():
+        return f"{base_prompt}\n\n用户的编辑说明: {user_prompt}"
+    return base_prompt
+
+
 class GPTImageGenerateBuilder(RequestBuilder):
     """GPT Image (gpt-image-1) 请求构建器
 
@@ -42,9 +82,7 @@ class GPTImageGenerateBuilder(RequestBuilder):
         action = params.get("__action", model_config.default_action)
 
         if not model_config.supports_action(action):
-            error_msg: str = _T("Action '{action}' not supported for model '{model_name}'.")
-            error_msg = error_msg.format(action=action, model_name=model_config.model_name)
-            raise ValueError(error_msg)
+            raise ValueError(_T("Action '{action}' not supported for model '{model_name}'.").format(action=action, model_name=model_config.model_name))
 
         url = model_config.build_api_url(auth_mode)
         endpoint = model_config.get_endpoint(auth_mode)
@@ -75,7 +113,7 @@ class GPTImageGenerateBuilder(RequestBuilder):
         )
 
     def _preprocess_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        processed = deepcopy(params)
+        processed = params.copy()  # 只修改顶层键, 浅拷贝即可与调用方隔离
         if "prompt" not in processed and "user_prompt" in processed:
             processed["prompt"] = processed.get("user_prompt", "")
         if "__action" not in processed:
@@ -89,15 +127,7 @@ class GPTImageGenerateBuilder(RequestBuilder):
             model_config: "ModelConfig",
             params: Dict[str, Any],
     ) -> Dict[str, str]:
-        headers = {}
-        for key, value in header_template.items():
-            if isinstance(value, str) and "{" in value:
-                for cred_key, cred_value in credentials.items():
-                    value = value.replace(f"{{{cred_key}}}", cred_value)
-                if "{size}" in value:
-                    value = value.replace("{size}", self._resolve_size(params))
-            headers[key] = value
-        return headers
+        return self._render_headers(header_template, {"size": self._resolve_size(params), **credentials})
 
     def _build_generate_payload(
             self,
@@ -255,22 +285,7 @@ class GPTImageGenerateBuilder(RequestBuilder):
         if get_pref().disable_system_prompt:
             return user_prompt
 
-        if user_prompt == "[智能修复]":
-            return EDIT_SMART_REPAIR
-
-        if has_mask and has_reference:
-            base_prompt = EDIT_WITH_MASK_AND_REFERENCES
-            return base_prompt
-        elif has_mask:
-            base_prompt = EDIT_WITH_MASK
-        elif has_reference:
-            base_prompt = EDIT_WITH_REFERENCES
-        else:
-            base_prompt = EDIT_BASE_PROMPT
-
-        if user_prompt.strip():
-            return f"{base_prompt}\n\n用户的编辑说明:\n{user_prompt.strip()}"
-        return base_prompt
+        return _compose_edit_prompt(user_prompt, has_mask, has_reference)
 
     def _build_generate_prompt(self, params: dict, has_reference: bool = False) -> str:
         user_prompt = params.get("prompt", "").strip()
@@ -278,21 +293,7 @@ class GPTImageGenerateBuilder(RequestBuilder):
             return user_prompt
 
         is_color_render = params.get("input_image_type", "") != "CameraDepth"
-
-        if is_color_render:
-            if has_reference:
-                base_prompt = GENERATE_RENDER_WITH_REFERENCE
-            else:
-                base_prompt = GENERATE_RENDER_WITHOUT_REFERENCE
-        else:
-            if has_reference:
-                base_prompt = GENERATE_DEPTH_MAP_WITH_REFERENCE
-            else:
-                base_prompt = GENERATE_DEPTH_MAP_WITHOUT_REFERENCE
-
-        if user_prompt.strip():
-            return f"{base_prompt}\n\n用户的编辑说明: {user_prompt.strip()}"
-        return base_prompt
+        return _compose_generate_prompt(user_prompt, has_reference, is_color_render)
 
     def _should_exclude_system_prompt(self, params: Dict[str, Any]) -> bool:
         return params.get("__disable_system_prompt", False) or get_pref().disable_system_prompt
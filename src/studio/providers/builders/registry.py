@@ -1,7 +1,8 @@
+import importlib
 import logging
 from bpy.app.translations import pgettext as _T
-from typing import Dict, Type, Union, Callable
-from .base import RequestBuilder
+from typing import Dict, Type, Union, Callable, Optional
+from .base import RequestBuilder, RequestData
 try:
     from ....logger import logger
 except ImportError:
@@ -14,17 +15,28 @@ class BuilderRegistry:
     负责注册和获取请求构建器实例。
     """
 
-    _builders: Dict[str, Type[RequestBuilder]] = {}
+    _builders: Dict[str, Union[Type[RequestBuilder], Callable[[], RequestBuilder], str]] = {}
     _instances: Dict[str, RequestBuilder] = {}
 
     @classmethod
-    def register(cls, name: str, builder_class: Union[Type[RequestBuilder], Callable[[], RequestBuilder]]) -> None:
+    def register(
+        cls,
+        name: str,
+        builder_class: Union[Type[RequestBuilder], Callable[[], RequestBuilder], None] = None,
+        *,
+        lazy: Optional[str] = None,
+    ) -> None:
         """注册一个构建器类
 
         Args:
             name: 构建器名称（与配置文件中的 request_builder 字段对应）
             builder_class: 构建器类（继承自 RequestBuilder）
+            lazy: 延迟加载的构建器 "模块:类名"（模块相对于本包），第一次 get 时才导入
         """
+        if lazy is not None:
+            cls._builders[name] = lazy
+            logger.info(f"Registered lazy builder: {name}")
+            return
         if not (callable(builder_class) or (isinstance(builder_class, type) and issubclass(builder_class, RequestBuilder))):
             raise TypeError(f"{builder_class} must be a subclass of RequestBuilder or a callable factory")
         cls._builders[name] = builder_class
@@ -43,14 +55,32 @@ class BuilderRegistry:
         Raises:
             ValueError: 构建器未注册
         """
-        if name not in cls._builders:
-            raise ValueError(_T("Builder '{name}' not registered.").format(name=name))
+        instance = cls._instances.get(name)
+        if instance is not None:
+            return instance
+
+        try:
+            builder_class = cls._builders[name]
+        except KeyError:
+            raise ValueError(_T("Builder '{name}' not registered.").format(name=name)) from None
+
+        if isinstance(builder_class, str):
+            module_name, _, class_name = builder_class.partition(":")
+            module = importlib.import_module(module_name, __package__)
+            builder_class = cls._builders[name] = getattr(module, class_name)
 
         # 使用单例模式，每个构建器只创建一次
-        if name not in cls._instances:
-            cls._instances[name] = cls._builders[name]()
+        instance = cls._instances[name] = builder_class()
+        return instance
+
+    @classmethod
+    def resolve(cls, name: str) -> Callable[..., RequestData]:
+        """获取构建器实例的 build 方法, 调用方可以直接缓存该绑定方法
 
-        return cls._instances[name]
+        Raises:
+            ValueError: 构建器未注册
+        """
+        return cls.get(name).build
 
     @classmethod
     def list_builders(cls) -> list[str]:
@@ -1,7 +1,7 @@
-import base64
-from copy import deepcopy
-from pathlib import Path
-from typing import Dict, Any, TYPE_CHECKING, List
+import os
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, Any, TYPE_CHECKING, List, Iterable
 
 from bpy.app.translations import pgettext as _T
 
@@ -17,12 +17,70 @@ from .seedream_prompt import (
     EDIT_WITH_REFERENCES,
     EDIT_BASE_PROMPT,
 )
-from ....utils import get_pref
+from ....utils import get_pref, file_to_base64
 
 if TYPE_CHECKING:
     from ...config.model_registry import ModelConfig
 
 
+def _as_iter(v: Any) -> Iterable[Any]:
+    if v is None:
+        return ()
+    if isinstance(v, list):
+        return v
+    return (v,)
+
+
+# 文件扩展名 -> data URL 中的图片格式
+_EXT_TO_FORMAT = {
+    "jpg": "jpeg",
+    "jpeg": "jpeg",
+    "png": "png",
+    "webp": "webp",
+    "gif": "gif",
+}
+
+
+# (有遮罩, 有参考图片) -> 编辑基础提示词
+_EDIT_PROMPTS = {
+    (True, True): EDIT_WITH_MASK_AND_REFERENCES,
+    (True, False): EDIT_WITH_MASK,
+    (False, True): EDIT_WITH_REFERENCES,
+    (False, False): EDIT_BASE_PROMPT,  # 只有提示词输入的基本提示词
+}
+
+# (彩色渲染, 有参考图片) -> 生成基础提示词
+_GENERATE_PROMPTS = {
+    (True, True): GENERATE_RENDER_WITH_REFERENCE,
+    (True, False): GENERATE_RENDER_WITHOUT_REFERENCE,
+    (False, True): GENERATE_DEPTH_MAP_WITHOUT_REFERENCE,
+    (False, False): GENERATE_DEPTH_MAP_WITH_REFERENCE,
+}
+
+
+@lru_cache(maxsize=128)
+def _compose_edit_prompt(user_prompt: str, has_mask: bool, has_reference: bool) -> str:
+    """系统提示词 + 用户提示词, 只依赖参数, 结果可以缓存"""
+    if user_prompt == "[智能修复]":  # 智能修复的提示词
+        return EDIT_SMART_REPAIR
+
+    base_prompt = _EDIT_PROMPTS[has_mask, has_reference]
+    # 有遮罩和参考图片时不附加用户提示词
+    if has_mask and has_reference:
+        return base_prompt
+    if user_prompt := user_prompt.strip():
+        return f"{base_prompt}\n\n用户的编辑说明:\n{user_prompt}"
+    return base_prompt
+
+
+@lru_cache(maxsize=128)
+def _compose_generate_prompt(user_prompt: str, has_reference: bool, is_color_render: bool) -> str:
+    base_prompt = _GENERATE_PROMPTS[is_color_render, has_reference]
+    if user_prompt := user_prompt.strip():
+        return f"{base_prompt}\n\n用户的编辑说明: {user_prompt}"
+    return base_prompt
+
+
 class SeedreamImageGenerateBuilder(RequestBuilder):
     def build(self, params: Dict[str, Any], model_config: "ModelConfig", auth_mode: str,
               credentials: Dict[str, str]) -> RequestData:
@@ -30,9 +88,7 @@ class SeedreamImageGenerateBuilder(RequestBuilder):
         action = params.get("__action", model_config.default_action)
 
         if not model_config.supports_action(action):
-            error_msg: str = _T("Action '{action}' not supported for model '{model_name}'.")
-            error_msg = error_msg.format(action=action, model_name=model_config.model_name)
-            raise ValueError(error_msg)
+            raise ValueError(_T("Action '{action}' not supported for model '{model_name}'.").format(action=action, model_name=model_config.model_name))
 
         url = model_config.build_api_url(auth_mode)
         endpoint = model_config.get_endpoint(auth_mode)
@@ -59,7 +115,7 @@ class SeedreamImageGenerateBuilder(RequestBuilder):
         )
 
     def _preprocess_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        processed = deepcopy(params)
+        processed = params.copy()  # 只修改顶层键, 浅拷贝即可与调用方隔离
         # 兼容上游字段：prompt / user_prompt
         if "prompt" not in processed and "user_prompt" in processed:
             processed["prompt"] = processed.get("user_prompt", "")
@@ -74,21 +130,8 @@ class SeedreamImageGenerateBuilder(RequestBuilder):
             model_config: "ModelConfig",
             params: Dict[str, Any],
     ) -> Dict[str, str]:
-        headers = {}
-
-        for key, value in header_template.items():
-            if isinstance(value, str) and "{" in value:
-                # 替换认证凭证占位符
-                for cred_key, cred_value in credentials.items():
-                    value = value.replace(f"{{{cred_key}}}", cred_value)
-
-                # 特殊占位符替换
-                if "{size}" in value:
-                    value = value.replace("{size}", params.get("resolution", "1K"))
-
-            headers[key] = value
-
-        return headers
+        # 认证凭证优先, {size} 未在凭证中提供时从 params 中获取
+        return self._render_headers(header_template, {"size": params.get("resolution", "1K"), **credentials})
 
     def _build_generate_payload(self, params: Dict[str, Any], model_config: "ModelConfig") -> dict:
         """
@@ -166,46 +209,26 @@ class SeedreamImageGenerateBuilder(RequestBuilder):
         - params['mask_path']
         """
 
-        def _as_list(v: Any) -> List[Any]:
-            if v is None:
-                return []
-            if isinstance(v, list):
-                return v
-            return [v]
-
-        candidates: List[Any] = []
-        candidates += _as_list(params.get("image"))
-        candidates += _as_list(params.get("main_image"))
-        candidates += _as_list(params.get("image_path"))
-        candidates += _as_list(params.get("mask_path"))
-        candidates += _as_list(params.get("reference_images"))
-
-        out: List[str] = []
-        for item in candidates:
-            if not item:
-                continue
-
-            if isinstance(item, (str, Path)):
-                p = Path(item)
-                if p.exists() and p.is_file():
-                    out.append(self._file_to_data_url(p))
-                    continue
-
-        return out
-
-    def _file_to_data_url(self, path: Path) -> str:
-        ext = path.suffix.lower().lstrip(".")
-        if ext in {"jpg", "jpeg"}:
-            fmt = "jpeg"
-        elif ext in {"png", "webp", "gif"}:
-            fmt = ext
-        else:
-            # Seedream 文档示例允许 <图片格式>，这里兜底按 png 处理
-            fmt = "png"
+        candidates = chain.from_iterable(
+            _as_iter(params.get(key))
+            for key in ("image", "main_image", "image_path", "mask_path", "reference_images")
+        )
+
+        # isfile 一次系统调用同时判断存在和文件类型
+        paths = [
+            item
+            for item in candidates
+            if item and isinstance(item, (str, os.PathLike)) and os.path.isfile(item)
+        ]
+        return self._encode_images(self._file_to_data_url, paths)
+
+    def _file_to_data_url(self, path: "str | os.PathLike") -> str:
+        ext = os.path.splitext(path)[1][1:].lower()
+        # Seedream 文档示例允许 <图片格式>，这里兜底按 png 处理
+        fmt = _EXT_TO_FORMAT.get(ext, "png")
 
-        raw = path.read_bytes()
-        b64 = base64.b64encode(raw).decode("utf-8")
-        return f"data:image/{fmt};base64,{b64}"
+        # 前缀直接写入编码结果, 不再额外拼接一次完整的 base64 字符串
+        return file_to_base64(path, prefix=f"data:image/{fmt};base64,")
 
     def _build_edit_prompt(self, user_prompt: str, has_mask: bool = False, has_reference: bool = False) -> str:
         """Build prompt for image editing
@@ -217,24 +240,7 @@ class SeedreamImageGenerateBuilder(RequestBuilder):
         if get_pref().disable_system_prompt:
             return user_prompt
 
-        if user_prompt == "[智能修复]":  # 智能修复的提示词
-            base_prompt = EDIT_SMART_REPAIR
-            return base_prompt
-
-        if has_mask and has_reference:  # 有遮罩和参考图片
-            base_prompt = EDIT_WITH_MASK_AND_REFERENCES
-            return base_prompt
-        elif has_mask:  # 有遮罩
-            base_prompt = EDIT_WITH_MASK
-        elif has_reference:  # 有参考图片
-            base_prompt = EDIT_WITH_REFERENCES
-        else:
-            # 没有遮罩也没有参考图片,只有提示词输入的基本提示词
-            base_prompt = EDIT_BASE_PROMPT
-        if user_prompt.strip():
-            return f"{base_prompt}\n\n用户的编辑说明:\n{user_prompt.strip()}"
-        else:
-            return base_prompt
+        return _compose_edit_prompt(user_prompt, has_mask, has_reference)
 
     def _build_generate_prompt(
             self,
@@ -246,19 +252,7 @@ class SeedreamImageGenerateBuilder(RequestBuilder):
         if self._should_exclude_system_prompt(params):
             return user_prompt
 
-        if is_color_render:
-            if has_reference:
-                base_prompt = GENERATE_RENDER_WITH_REFERENCE
-            else:
-                base_prompt = GENERATE_RENDER_WITHOUT_REFERENCE
-        else:
-            if has_reference:
-                base_prompt = GENERATE_DEPTH_MAP_WITHOUT_REFERENCE
-            else:
-                base_prompt = GENERATE_DEPTH_MAP_WITH_REFERENCE
-        if user_prompt.strip():
-            return f"{base_prompt}\n\n用户的编辑说明: {user_prompt.strip()}"
-        return base_prompt
+        return _compose_generate_prompt(user_prompt, has_reference, is_color_render)
 
     def _should_exclude_system_prompt(self, params: Dict[str, Any]) -> bool:
         return params.get("__disable_system_prompt", False) or get_pref().disable_system_prompt
@@ -1,16 +1,12 @@
-import base64
 import logging
-import numpy as np
-import OpenImageIO as oiio
 import requests
-import tempfile
+import struct
+import zlib
 
-from pathlib import Path
 from typing import List, Tuple, Any
 from .base import ResponseParser
-from .utils import _check_response_account_mode
+from .utils import _b64decode, _check_response_account_mode, _load_response_json
 from ...exception import StudioException
-from ....utils import get_temp_folder
 
 try:
     from ....logger import logger
@@ -53,7 +49,7 @@ class GeminiImageParser(ResponseParser):
         self._check_response(response)
 
         # 获取 JSON 响应
-        resp_json = response.json()
+        resp_json = _load_response_json(response)
 
         # 检查响应体中的错误
         self._check_response_custom(resp_json)
@@ -174,29 +170,16 @@ def _parse_image_data_from_response_json(resp: dict) -> List[Tuple[str, bytes]]:
 
     # 查找图片数据
     for part in parts:
-        inline_data_key = None
-        if "inline_data" in part:
-            inline_data_key = "inline_data"
-        elif "inlineData" in part:
-            inline_data_key = "inlineData"
-
-        if not inline_data_key:
+        # 兼容 snake_case 与 camelCase 两种字段名
+        inline_data: dict = part.get("inline_data") or part.get("inlineData")
+        if not inline_data:
             continue
-        inline_data: dict = part[inline_data_key]
-
-        data_key = None
-        if "data" in inline_data:
-            data_key = "data"
-        elif "bytes" in inline_data:
-            data_key = "bytes"
 
-        if not data_key:
+        raw = inline_data.get("data") or inline_data.get("bytes")
+        if not raw:
             continue
-
-        if not inline_data[data_key]:
-            continue
-        mime_type = inline_data.get("mime_type", inline_data.get("mimeType", "image/jpeg"))
-        image_data = base64.b64decode(inline_data[data_key])
+        mime_type = inline_data.get("mime_type") or inline_data.get("mimeType") or "image/jpeg"
+        image_data = _b64decode(raw)
         return [(mime_type, image_data)]
 
     # 无图时，返回占位符图片
@@ -207,24 +190,25 @@ def _parse_image_data_from_response_json(resp: dict) -> List[Tuple[str, bytes]]:
 
 
 def _create_placeholder_image() -> List[Tuple[str, bytes]]:
-    try:
-        width, height = 100, 100
-        png_data = _create_empty_image(width, height, (0, 100, 200))
-        return [("image/png", png_data)]
-    except Exception as e:
-        raise GeminiAPIError(f"Failed to create placeholder: {str(e)}")
+    return [("image/png", _PLACEHOLDER_PNG)]
 
 
 def _create_empty_image(width: int, height: int, color: tuple) -> bytes:
-    temp_folder = get_temp_folder(prefix="gen")
-    with tempfile.NamedTemporaryFile(suffix=".png", dir=temp_folder) as f:
-        spec = oiio.ImageSpec(width, height, len(color), oiio.UINT8)
-        out = oiio.ImageOutput.create(f.name)
-        if not out:
-            raise Exception(f"Could not create ImageOutput for {f.name}")
-        pixels = np.full((height, width, len(color)), color, dtype=np.uint8)
-        out.open(f.name, spec)
-        out.write_image(pixels)
-        out.close()
-        png_data = Path(f.name).read_bytes()
-        return png_data
+    """生成纯色 8 位 RGB/RGBA PNG, 直接在内存中编码, 不经过临时文件"""
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    color_type = {3: 2, 4: 6}[len(color)]
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    row = b"\x00" + bytes(color) * width  # 每行以滤波类型 0 开头
+    return b"".join((
+        b"\x89PNG\r\n\x1a\n",
+        chunk(b"IHDR", ihdr),
+        chunk(b"IDAT", zlib.compress(row * height, 1)),  # 纯色数据最快压缩级别已足够
+        chunk(b"IEND", b""),
+    ))
+
+
+# 无图时返回的占位图, 内容固定, 导入时生成一次
+_PLACEHOLDER_PNG = _create_empty_image(100, 100, (0, 100, 200))
@@ -1,11 +1,9 @@
-import base64
 import logging
-import mimetypes
 import requests
 
-from typing import List, Tuple, Any, Optional
+from typing import List, Tuple, Any
 from .base import ResponseParser
-from .utils import _check_response_account_mode
+from .utils import _check_response_account_mode, _load_response_json, _parse_b64_data
 from ...exception import StudioException
 
 try:
@@ -25,19 +23,18 @@ class GPTImageParser(ResponseParser):
 
     def parse(self, response: requests.Response) -> List[Tuple[str, Any]]:
         self._check_response(response)
-        resp_json = response.json()
+        resp_json = _load_response_json(response)
         self._check_response_custom(resp_json)
         data = self._process_resp_json(resp_json)
 
         try:
             res = _parse_image_data_from_response_json(data)
         except Exception as e:
-            print(data)
+            logger.debug("Failed to parse response: %s", data)
             raise e
         return res
 
     def _check_response_custom(self, resp: dict):
-        print(resp)
         _check_response_account_mode(resp)
 
     def _process_resp_json(self, resp) -> dict:
@@ -61,18 +58,23 @@ class GPTImageParser(ResponseParser):
         if code == 502:
             logger.debug(getattr(response, "text", ""))
             raise GPTImageAPIError("Server Error: Bad Gateway.")
-        try:
-            j = response.json()
-            if isinstance(j, dict) and "error" in j:
-                err = j.get("error")
-                if isinstance(err, dict):
-                    msg = err.get("message") or str(err)
-                    raise GPTImageAPIError(msg)
-                raise GPTImageAPIError(str(err))
+        # 代理返回的错误页通常是 HTML, 只有 JSON 响应才尝试解析
+        j = None
+        if "json" in response.headers.get("content-type", ""):
+            try:
+                j = response.json()
+            except ValueError:
+                pass
+        if isinstance(j, dict) and "error" in j:
+            err = j.get("error")
+            if isinstance(err, dict):
+                raise GPTImageAPIError(err.get("message") or str(err))
+            raise GPTImageAPIError(str(err))
+        if j is not None:
             raise GPTImageAPIError(str(j))
-        except Exception:
-            logger.error(response.text)
-            raise GPTImageAPIError("API request failed. Unknown error.")
+        # 部分错误页有数 MB, 只记录开头
+        logger.error(response.text[:1024])
+        raise GPTImageAPIError("API request failed. Unknown error.")
 
 
 class GPTImageAPIError(StudioException):
@@ -80,6 +82,15 @@ class GPTImageAPIError(StudioException):
 
 
 def _parse_image_data_from_response_json(resp: dict) -> List[Tuple[str, bytes]]:
+    # 快速路径: 绝大多数响应都是 {"data": [{"b64_json": "..."}]}, 其余形状走下面的完整检查
+    try:
+        b64 = resp["data"][0]["b64_json"]
+    except (KeyError, IndexError, TypeError):
+        pass
+    else:
+        if result := _parse_b64_data(b64):
+            return result
+
     if not isinstance(resp, dict):
         raise GPTImageAPIError("Invalid response format")
 
@@ -107,11 +118,3 @@ def _parse_image_data_from_response_json(resp: dict) -> List[Tuple[str, bytes]]:
         raise GPTImageAPIError(str(err))
 
     raise GPTImageAPIError("Generating... please wait...")
-
-
-def _parse_b64_data(b64: str) -> Optional[List[Tuple[str, bytes]]]:
-    if isinstance(b64, str) and b64:
-        b64_data = b64.split("base64,", maxsplit=1)[1] if "base64," in b64 else b64
-        mime = mimetypes.guess_type(b64) or ("image/png", None)
-        img_bytes = base64.b64decode(b64_data)
-        return [(mime[0], img_bytes)]
@@ -32,6 +32,12 @@ class ParserRegistry:
         if not (callable(parser_class) or (isinstance(parser_class, type) and issubclass(parser_class, ResponseParser))):
             raise TypeError(f"{parser_class} must be a subclass of ResponseParser or a callable factory")
 
+        # 同名重复注册会静默覆盖已有解析器, 给出提示便于发现
+        previous = cls._parsers.get(name)
+        if previous is not None and previous is not parser_class:
+            logger.warning(f"Parser '{name}' is registered again, replacing {previous}")
+            cls._instances.pop(name, None)
+
         cls._parsers[name] = parser_class
         logger.info(f"Registered parser: {name}")
 
@@ -48,20 +54,19 @@ class ParserRegistry:
         Raises:
             ValueError: 如果解析器未注册
         """
-        if name not in cls._parsers:
-            available = ", ".join(cls._parsers.keys())
-            raise ValueError(f"Parser '{name}' not registered. Available parsers: {available or 'None'}")
+        instance = cls._instances.get(name)
+        if instance is not None:
+            return instance
 
-        # 使用单例模式，每个解析器只创建一次
-        if name not in cls._instances:
+        try:
             parser_factory = cls._parsers[name]
-            # 如果是工厂函数，直接调用；否则实例化类
-            if isinstance(parser_factory, type):
-                cls._instances[name] = parser_factory()
-            else:
-                cls._instances[name] = parser_factory()
+        except KeyError:
+            available = ", ".join(cls._parsers.keys())
+            raise ValueError(f"Parser '{name}' not registered. Available parsers: {available or 'None'}") from None
 
-        return cls._instances[name]
+        # 使用单例模式，每个解析器只创建一次; 类和工厂函数都直接调用
+        instance = cls._instances[name] = parser_factory()
+        return instance
 
     @classmethod
     def list_parsers(cls) -> list[str]:
@@ -1,11 +1,10 @@
-import base64
 import logging
-import mimetypes
+import re
 import requests
 
-from typing import List, Tuple, Any, Optional
+from typing import List, Tuple, Any
 from .base import ResponseParser
-from .utils import _check_response_account_mode
+from .utils import _b64decode_strict, _check_response_account_mode, _load_response_json, _parse_b64_data, _sniff_mime
 from ...exception import StudioException
 
 try:
@@ -13,6 +12,9 @@ try:
 except Exception:
     logger = logging.getLogger(__name__)
 
+# 成功响应中第一张图的 b64_json; 值为 data URL 或含转义字符(如 \/)时不匹配, 交给完整 JSON 解析
+_B64_JSON_RE = re.compile(rb'"b64_json"\s*:\s*"([A-Za-z0-9+/=]+)"')
+
 
 class SeedreamImageParser(ResponseParser):
     def __init__(self, is_account_mode: bool = False):
@@ -22,8 +24,16 @@ class SeedreamImageParser(ResponseParser):
         # 检查 HTTP 状态码
         self._check_response(response)
 
+        # 快速路径: 直接在原始字节中定位图片数据, 跳过解析数 MB 的 JSON
+        content = response.content
+        if match := _B64_JSON_RE.search(content):
+            # 通过 memoryview 直接解码原始字节, 不再复制出 base64 的 bytes 和 str
+            payload = memoryview(content)[match.start(1):match.end(1)]
+            img_bytes = _b64decode_strict(payload)
+            return [(_sniff_mime(img_bytes, "image/jpeg"), img_bytes)]
+
         # 获取 JSON 响应
-        resp_json = response.json()
+        resp_json = _load_response_json(response)
 
         # 检查响应体中的错误
         self._check_response_custom(resp_json)
@@ -34,7 +44,7 @@ class SeedreamImageParser(ResponseParser):
         try:
             res = _parse_image_data_from_response_json(data)
         except Exception as e:
-            print(data)
+            logger.debug("Failed to parse response: %s", data)
             raise e
         return res
 
@@ -62,19 +72,24 @@ class SeedreamImageParser(ResponseParser):
         if code == 502:
             logger.debug(getattr(response, "text", ""))
             raise SeedreamAPIError("Server Error: Bad Gateway.")
-        try:
-            j = response.json()
-            # OpenAI 风格 error
-            if isinstance(j, dict) and "error" in j:
-                err = j.get("error")
-                if isinstance(err, dict):
-                    msg = err.get("message") or str(err)
-                    raise SeedreamAPIError(msg)
-                raise SeedreamAPIError(str(err))
+        # 代理返回的错误页通常是 HTML, 只有 JSON 响应才尝试解析
+        j = None
+        if "json" in response.headers.get("content-type", ""):
+            try:
+                j = response.json()
+            except ValueError:
+                pass
+        # OpenAI 风格 error
+        if isinstance(j, dict) and "error" in j:
+            err = j.get("error")
+            if isinstance(err, dict):
+                raise SeedreamAPIError(err.get("message") or str(err))
+            raise SeedreamAPIError(str(err))
+        if j is not None:
             raise SeedreamAPIError(str(j))
-        except Exception:
-            logger.error(response.text)
-            raise SeedreamAPIError("API request failed. Unknown error.")
+        # 部分错误页有数 MB, 只记录开头
+        logger.error(response.text[:1024])
+        raise SeedreamAPIError("API request failed. Unknown error.")
 
 
 class SeedreamAPIError(StudioException):
@@ -82,10 +97,20 @@ class SeedreamAPIError(StudioException):
 
 
 def _parse_image_data_from_response_json(resp: dict) -> List[Tuple[str, bytes]]:
+    # 快速路径: 绝大多数响应都是 {"data": [{"b64_json": "..."}]}, 其余形状走下面的完整检查
+    try:
+        b64 = resp["data"][0]["b64_json"]
+    except (KeyError, IndexError, TypeError):
+        pass
+    else:
+        if result := _parse_b64_data(b64, default_mime="image/jpeg"):
+            return result
+
     if not isinstance(resp, dict):
         raise SeedreamAPIError("Invalid response format")
 
     # data示例：{"data":[{"b64_json": "...", "size": "1760x2368"}], ...}
+    # 请求中 sequential_image_generation 为 disabled, 每次只返回一张图, 只解码第一项
     data_list = resp.get("data")
     if isinstance(data_list, list) and data_list:
         item = data_list[0] if isinstance(data_list[0], dict) else None
@@ -100,7 +125,7 @@ def _parse_image_data_from_response_json(resp: dict) -> List[Tuple[str, bytes]]:
         # 兼容：直接返回 {"b64_json": "..."}
         b64 = resp.get("b64_json")
 
-    if result := _parse_b64_data(b64):
+    if result := _parse_b64_data(b64, default_mime="image/jpeg"):
         return result
 
     # OpenAI 风格 error
@@ -111,11 +136,3 @@ def _parse_image_data_from_response_json(resp: dict) -> List[Tuple[str, bytes]]:
         raise SeedreamAPIError(str(err))
 
     raise SeedreamAPIError("Invalid response format - missing image data.")
-
-
-def _parse_b64_data(b64: str) -> Optional[Tuple[str, bytes]]:
-    if isinstance(b64, str) and b64:
-        b64_data = b64.split("base64,", maxsplit=1)[1] if "base64," in b64 else b64
-        mime = mimetypes.guess_type(b64) or ("image/jpeg", None)
-        img_bytes = base64.b64decode(b64_data)
-        return [(mime[0], img_bytes)]
@@ -1,3 +1,8 @@
+import binascii
+import requests
+
+from typing import Any, List, Optional, Tuple
+
 from ...exception import (
     InsufficientBalanceException,
     APIRequestException,
@@ -5,6 +10,47 @@ from ...exception import (
     ToeknExpiredException,
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # 可选依赖: pybase64 使用 SIMD 实现, 解码大图比标准库快数倍
+    from pybase64 import b64decode as _b64decode
+except ImportError:
+    # a2b_base64 直接接受 ASCII str, 不额外复制; 输出按 len/4*3 一次分配, 只去掉填充字节, 无需再预分配
+    _b64decode = binascii.a2b_base64
+    _b64decode_strict = binascii.a2b_base64
+else:
+    def _b64decode_strict(data) -> bytes:
+        # b64_json 通常是标准字母表且带填充, validate=True 可以走 pybase64 最快的解码路径;
+        # 含换行/空白时严格模式会报错, 回退到与标准库一致的宽松解码
+        try:
+            return _b64decode(data, validate=True)
+        except binascii.Error:
+            return _b64decode(data)
+
+
+def _load_response_json(response: requests.Response) -> Any:
+    """解析响应 JSON
+
+    图像响应中包含数 MB 的 base64 字符串, 安装了 orjson 时直接解析原始字节,
+    省去解码为 str 的过程; 否则回退到 response.json()。
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+# 账号模式错误信息 -> (异常类型, 英文提示), 只在出错时实例化异常
+_ACCOUNT_ERRORS = {
+    "余额不足": (InsufficientBalanceException, "Insufficient balance!"),
+    "API请求错误!": (APIRequestException, "API Request Error!"),
+    "鉴权错误": (AuthFailedException, "Authentication failed!"),
+    "Token过期": (ToeknExpiredException, "Token expired!"),
+}
+
 
 def _check_response_account_mode(resp: dict):
     """
@@ -26,10 +72,31 @@ def _check_response_account_mode(resp: dict):
     err_msg = resp.get("errMsg", "")
     if not err_msg:
         return
-    err_type_map = {
-        "余额不足": InsufficientBalanceException("Insufficient balance!"),
-        "API请求错误!": APIRequestException("API Request Error!"),
-        "鉴权错误": AuthFailedException("Authentication failed!"),
-        "Token过期": ToeknExpiredException("Token expired!"),
-    }
-    raise err_type_map.get(err_msg, Exception(err_msg))
+    exc_cls, message = _ACCOUNT_ERRORS.get(err_msg, (Exception, err_msg))
+    raise exc_cls(message)
+
+
+def _sniff_mime(data: bytes, default_mime: str) -> str:
+    """根据文件头判断图片格式, 只比较开头的几个字节"""
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "image/png"
+    if data[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return default_mime
+
+
+def _parse_b64_data(b64: str, default_mime: str = "image/png") -> Optional[List[Tuple[str, bytes]]]:
+    """解码 OpenAI 风格的 b64_json 字段(可带 data URL 前缀), 为空时返回 None"""
+    if isinstance(b64, str) and b64:
+        # 只有 data URL 才查找逗号(紧跟在短头部之后), 纯 base64 不再整体扫描一遍; MIME 直接取自头部
+        if b64.startswith("data:"):
+            head, _, b64_data = b64.partition(",")
+            mime = head[5:].partition(";")[0]
+        else:
+            mime, b64_data = "", b64
+        img_bytes = _b64decode_strict(b64_data)
+        # 没有 data URL 头时按解码后的文件头判断, 识别不了再用默认值
+        return [(mime or _sniff_mime(img_bytes, default_mime), img_bytes)]
+    return None
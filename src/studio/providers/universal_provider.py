@@ -1,5 +1,8 @@
 import requests
-from typing import Dict, Any
+from requests.adapters import HTTPAdapter
+from http.cookiejar import DefaultCookiePolicy
+from threading import Lock, local
+from typing import Dict, Any, Optional
 from .base import BaseProvider
 from .builders import BuilderRegistry
 from .parsers import ParserRegistry
@@ -21,6 +24,38 @@ class UniversalProvider(BaseProvider):
     - 文本（生成、翻译、摘要）
     """
 
+    # 每个任务都会创建新的 Provider; 连接池(HTTPAdapter)在类上共享, 复用 keep-alive 连接, 省去每次的 TCP/TLS 握手.
+    # Session 不保证线程安全, 按线程各建一个; 且不保存任何 Cookie, 切换账号或 API Key 后不会带上旧的 Cookie
+    _adapter: Optional[HTTPAdapter] = None
+    _local = local()
+    _sessions: list[requests.Session] = []
+    _session_lock = Lock()
+
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        session = getattr(cls._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            with cls._session_lock:  # 任务在各自的线程中执行
+                if cls._adapter is None:
+                    # 多个任务线程并发请求同一服务, 共用的连接池足够大才能复用连接而不是用完即丢
+                    cls._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+                session.mount("https://", cls._adapter)
+                session.mount("http://", cls._adapter)
+                cls._sessions.append(session)
+            cls._local.session = session
+        return session
+
+    @classmethod
+    def close_session(cls):
+        with cls._session_lock:
+            for session in cls._sessions:
+                session.close()
+            cls._sessions.clear()
+            cls._adapter = None
+            cls._local = local()
+
     def __init__(self, model_config: ModelConfig, auth_mode: str, credentials: Dict[str, str], task_id: str):
         """初始化通用 Provider
 
@@ -43,6 +78,7 @@ class UniversalProvider(BaseProvider):
 
         # 动态加载构建器
         self.request_builder = self._get_builder(model_config.request_builder)
+        self._build_request = self.request_builder.build  # 构建器是单例, 直接保存绑定方法
         logger.debug(f"Using request builder: {self.request_builder}")
 
         # 动态加载觧析器（优先从 endpoint 配置中获取）
@@ -68,6 +104,9 @@ class UniversalProvider(BaseProvider):
         - 视频：生成、编辑、转换
         - 文本：生成、翻译、摘要
 
+        该方法会阻塞到响应解析完成（上传 + 生成 + 下载，通常需要数秒），
+        由 TaskManager 在线程池中调用，不要在 Blender 主线程（UI）中直接调用。
+
         Args:
             params: 参数字典，由用户提供，必须包含：
                 - action: 功能类型（可选，默认使用 model_config.default_action）
@@ -86,7 +125,7 @@ class UniversalProvider(BaseProvider):
             Exception: 其他异常
         """
         # 1. 使用 Builder 构建完整请求
-        request_data = self.request_builder.build(
+        request_data = self._build_request(
             params=params,
             model_config=self.model_config,
             auth_mode=self.auth_mode,
@@ -98,11 +137,18 @@ class UniversalProvider(BaseProvider):
             request_data.query_params["reqId"] = self.task_id
 
         # 2. 发送 HTTP 请求
-        response = requests.request(
+        headers = request_data.headers
+        body = None
+        if request_data.payload is not None and not request_data.files:
+            body = request_data.body_bytes()
+            if not any(key.lower() == "content-type" for key in headers):
+                headers = {**headers, "Content-Type": "application/json"}
+
+        response = self.get_session().request(
             method=request_data.method,
             url=request_data.url,
-            headers=request_data.headers,
-            json=request_data.payload,
+            headers=headers,
+            data=body,
             files=request_data.files,
             params=request_data.query_params,
             timeout=request_data.timeout,
@@ -8,8 +8,8 @@ import threading
 import time
 import webbrowser
 from bpy.app.translations import pgettext, pgettext_iface as iface
-from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from shutil import copyfile
 from traceback import print_exc
@@ -26,8 +26,9 @@ from .gui.app.app import AppHud
 from .gui.app.renderer import imgui
 from .gui.app.style import Const
 from .gui.texture import TexturePool
-from .gui.widgets import CustomWidgets, with_child, DEFAULT_CHILD_FLAGS
+from .gui.widgets import CustomWidgets, color_u32, with_child, transparent_button, DEFAULT_CHILD_FLAGS
 from .image_tools import ImageToolRegistry, ToolState
+from .ops import FileCallbackRegistry
 from .wrapper import BaseAdapter, WidgetDescriptor, DescriptorFactory
 from ..i18n import STUDIO_TCTX
 from ..preferences import AuthMode, PricingStrategy
@@ -37,6 +38,26 @@ from ..utils import get_addon_version, get_pref
 from ..utils.render import BlenderRenderHelper
 
 
+@lru_cache(maxsize=256)
+def _file_stem(path: str) -> str:
+    """悬停预览/详情每帧都要显示文件名, 同一路径只解析一次"""
+    return Path(path).stem
+
+
+def _fit_preview_size(app: AppHud, tex_width: int, tex_height: int) -> tuple[float, float]:
+    """悬停预览图尺寸: 按屏幕缩放后限制在屏幕 70% 以内, 且不窄于提示框内容区"""
+    scale = app.screen_scale
+    # 先后按宽/高收缩等价于取两者与 1 的最小值
+    scale *= min(1.0, app.screen_width * 0.7 / (scale * tex_width), app.screen_height * 0.7 / (scale * tex_height))
+    width = tex_width * scale
+    height = tex_height * scale
+    aw = imgui.get_content_region_avail()[0]
+    if width < aw:
+        height *= aw / width
+        width = aw
+    return width, height
+
+
 def _T(msg, ctxt=STUDIO_TCTX):
     t = iface(msg, ctxt)
     if t == msg:
@@ -251,6 +272,12 @@ def _draw_image_context_menu_impl(
 
 class StudioImagesDescriptor(WidgetDescriptor):
     ptype = "IMAGE_LIST"
+    # 图片按钮三种状态的配色
+    BTN_COLORS = (
+        (imgui.Col.BUTTON, Const.BUTTON),
+        (imgui.Col.BUTTON_ACTIVE, Const.BUTTON_ACTIVE),
+        (imgui.Col.BUTTON_HOVERED, Const.BUTTON_HOVERED),
+    )
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -259,6 +286,10 @@ class StudioImagesDescriptor(WidgetDescriptor):
         self._ctx_menu_image_path: str = ""
         self._ctx_menu_pending_open: bool = False
         self._ctx_menu_active: bool = False
+        # 按钮 ID 每帧都要用到, 标题和属性名创建后不再变化, 只格式化一次
+        self._btn_id = f"##{self.title}_{self.widget_name}1"
+        self._close_id = f"##{self.title}_{self.widget_name}x"
+        self._image_push_ids: list[str] = []
         self.add_custom_display_end(self._display_image_tools)
 
     def _get_stable_cell_size(self):
@@ -287,19 +318,31 @@ class StudioImagesDescriptor(WidgetDescriptor):
         imgui.push_style_color(imgui.Col.FRAME_BG, self.col_widget)
 
         with with_child("##Inner", (0, 0), child_flags=self.flags):
-            imgui.push_style_var(imgui.StyleVar.CELL_PADDING, imgui.get_style().item_spacing)
+            # 单元格内边距即 item_spacing, 取一次传给每个单元格, 不在单元格内重复读取 style
+            item_spacing = imgui.get_style().item_spacing
+            imgui.push_style_var(imgui.StyleVar.CELL_PADDING, item_spacing)
             imgui.push_style_var(imgui.StyleVar.ITEM_SPACING, (0, 0))
             imgui.push_style_color(imgui.Col.TABLE_BORDER_STRONG, Const.TRANSPARENT)
             if imgui.begin_table("##Table", 3, imgui.TableFlags.BORDERS):
                 for i in range(3):
                     imgui.table_setup_column(f"##Column{i}", imgui.TableColumnFlags.WIDTH_STRETCH, 0, i)
-                for i, img in enumerate(self.value):
-                    imgui.table_next_column()
-                    imgui.push_id(f"##Image{i}")
-                    self.display_image_with_close(app, img, i)
-                    imgui.pop_id()
-
-                if len(self.value) < self.widget_def.get("limit", 999):
+                # value 每次访问都要经过 adapter.get_value, 本帧只取一次
+                images = self.value
+                push_ids = self._image_push_ids
+                # 每张图片都要调用一遍, 先绑定到局部变量
+                table_next_column = imgui.table_next_column
+                push_id = imgui.push_id
+                pop_id = imgui.pop_id
+                display_image_with_close = self.display_image_with_close
+                for i, img in enumerate(images):
+                    if i == len(push_ids):
+                        push_ids.append(f"##Image{i}")
+                    table_next_column()
+                    push_id(push_ids[i])
+                    display_image_with_close(app, img, i, item_spacing[0])
+                    pop_id()
+
+                if len(images) < self.widget_def.get("limit", 999):
                     imgui.table_next_column()
                     imgui.push_id("##Upload")
                     self.display_upload_image()
@@ -593,89 +636,56 @@ class StudioImagesDescriptor(WidgetDescriptor):
 
         bpy.app.timers.register(_poll_line_art_job)
 
-    def display_upload_image(self):
-        bw = bh = self._get_stable_cell_size()
-        icon = TexturePool.get_tex_id("image_new")
-        tex = TexturePool.get_tex(icon)
-        fbw = tex.width / max(tex.width, tex.height) if tex else 1
-        fbh = tex.height / max(tex.width, tex.height) if tex else 1
-        imgui.begin_group()
+    def _draw_image_button(self, icon: int, fbw: float, fbh: float, size: float):
+        """绘制方形按钮并在其中居中绘制圆角图片
+
+        Returns:
+            (是否点击, 按钮左上角, 按钮右下角, 绘制列表)
+        """
         imgui.set_next_item_allow_overlap()
-        imgui.push_style_color(imgui.Col.BUTTON, Const.BUTTON)
-        imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.BUTTON_ACTIVE)
-        imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.BUTTON_HOVERED)
-        clicked = imgui.button(f"##{self.title}_{self.widget_name}1", (bw, bh))
-        iw, ih = (bw * fbw, bh * fbh)
+        for col, value in self.BTN_COLORS:
+            imgui.push_style_color(col, value)
+        clicked = imgui.button(self._btn_id, (size, size))
+        imgui.pop_style_color(len(self.BTN_COLORS))
         pmin = imgui.get_item_rect_min()
-        pmini = (pmin[0] + (bw - iw) / 2, pmin[1] + (bh - ih) / 2)
         pmax = imgui.get_item_rect_max()
-        pmaxi = (pmax[0] - (bw - iw) / 2, pmax[1] - (bh - ih) / 2)
+        dx = size * (1 - fbw) / 2
+        dy = size * (1 - fbh) / 2
         dl = imgui.get_window_draw_list()
-        dl.add_image_rounded(icon, pmini, pmaxi, (0, 0), (1, 1), 0xFFFFFFFF, 15)
-        imgui.pop_style_color(3)
-        if clicked:
-            pos = imgui.get_mouse_pos()
-            imgui.set_next_window_pos((pos[0] - 40, pos[1] + 50), cond=imgui.Cond.ALWAYS)
-            self.adapter.on_image_action(self.widget_name, "upload_image")
-        imgui.end_group()
+        dl.add_image_rounded(icon, (pmin[0] + dx, pmin[1] + dy), (pmax[0] - dx, pmax[1] - dy), (0, 0), (1, 1), 0xFFFFFFFF, 15)
+        return clicked, pmin, pmax, dl
 
-    def display_paste_image(self):
-        bw = bh = self._get_stable_cell_size()
-        icon = TexturePool.get_tex_id("image_paste")
-        tex = TexturePool.get_tex(icon)
-        fbw = tex.width / max(tex.width, tex.height) if tex else 1
-        fbh = tex.height / max(tex.width, tex.height) if tex else 1
+    def _display_action_image(self, icon_name: str, action: str):
+        icon, fbw, fbh = TexturePool.get_tex_aspect(icon_name)
         imgui.begin_group()
-        imgui.set_next_item_allow_overlap()
-        imgui.push_style_color(imgui.Col.BUTTON, Const.BUTTON)
-        imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.BUTTON_ACTIVE)
-        imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.BUTTON_HOVERED)
-        clicked = imgui.button(f"##{self.title}_{self.widget_name}1", (bw, bh))
-        iw, ih = (bw * fbw, bh * fbh)
-        pmin = imgui.get_item_rect_min()
-        pmini = (pmin[0] + (bw - iw) / 2, pmin[1] + (bh - ih) / 2)
-        pmax = imgui.get_item_rect_max()
-        pmaxi = (pmax[0] - (bw - iw) / 2, pmax[1] - (bh - ih) / 2)
-        dl = imgui.get_window_draw_list()
-        dl.add_image_rounded(icon, pmini, pmaxi, (0, 0), (1, 1), 0xFFFFFFFF, 15)
-        imgui.pop_style_color(3)
+        clicked = self._draw_image_button(icon, fbw, fbh, self._get_stable_cell_size())[0]
         if clicked:
             pos = imgui.get_mouse_pos()
             imgui.set_next_window_pos((pos[0] - 40, pos[1] + 50), cond=imgui.Cond.ALWAYS)
-            self.adapter.on_image_action(self.widget_name, "paste_image")
+            self.adapter.on_image_action(self.widget_name, action)
         imgui.end_group()
 
-    def display_image_with_close(self, app: "AIStudio", img_path: str = "", index=-1):
+    def display_upload_image(self):
+        self._display_action_image("image_new", "upload_image")
+
+    def display_paste_image(self):
+        self._display_action_image("image_paste", "paste_image")
+
+    def display_image_with_close(self, app: "AIStudio", img_path: str = "", index=-1, isx: float | None = None):
         if not img_path:
             return
-        bw = bh = self._get_stable_cell_size()
-        icon = TexturePool.get_tex_id(img_path)
-        tex = TexturePool.get_tex(icon)
-        fbw = tex.width / max(tex.width, tex.height) if tex else 1
-        fbh = tex.height / max(tex.width, tex.height) if tex else 1
+        icon, fbw, fbh = TexturePool.get_tex_aspect(img_path, thumbnail=True)
         imgui.begin_group()
-        imgui.set_next_item_allow_overlap()
-        imgui.push_style_color(imgui.Col.BUTTON, Const.BUTTON)
-        imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.BUTTON_ACTIVE)
-        imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.BUTTON_HOVERED)
-        clicked = imgui.button(f"##{self.title}_{self.widget_name}1", (bw, bh))
-        iw, ih = (bw * fbw, bh * fbh)
-        pmin = imgui.get_item_rect_min()
-        pmini = (pmin[0] + (bw - iw) / 2, pmin[1] + (bh - ih) / 2)
-        pmax = imgui.get_item_rect_max()
-        pmaxi = (pmax[0] - (bw - iw) / 2, pmax[1] - (bh - ih) / 2)
-        dl = imgui.get_window_draw_list()
-        dl.add_image_rounded(icon, pmini, pmaxi, (0, 0), (1, 1), 0xFFFFFFFF, 15)
-        col = (84 / 255, 84 / 255, 84 / 255, 1)
+        clicked, pmin, pmax, dl = self._draw_image_button(icon, fbw, fbh, self._get_stable_cell_size())
+        col = Const.RP_R_BUTTON
         is_hovered = False
         if imgui.is_item_active():
-            col = (67 / 255, 207 / 255, 124 / 255, 1)
+            col = Const.CLOSE_BUTTON_HOVERED
         elif imgui.is_mouse_hovering_rect(pmin, pmax):
-            col = (67 / 255, 207 / 255, 124 / 255, 1)
+            col = Const.CLOSE_BUTTON_HOVERED
             is_hovered = True
-        col = imgui.get_color_u32(col)
+        col = color_u32(col)
         dl.add_rect((pmin[0] + 1, pmin[1] + 1), (pmax[0] - 1, pmax[1] - 1), col, 15, thickness=4)
-        imgui.pop_style_color(3)
         if clicked:
             pos = imgui.get_mouse_pos()
             imgui.set_next_window_pos((pos[0] - 40, pos[1] + 50), cond=imgui.Cond.ALWAYS)
@@ -688,41 +698,24 @@ class StudioImagesDescriptor(WidgetDescriptor):
         imgui.same_line()
         pos = imgui.get_cursor_pos()
         bw2, bh2 = 30, 30
-        isx = imgui.get_style().cell_padding[0]
+        if isx is None:
+            isx = imgui.get_style().cell_padding[0]
         imgui.set_cursor_pos((pos[0] - bw2, pos[1]))
 
-        imgui.push_style_color(imgui.Col.BUTTON, Const.TRANSPARENT)
-        imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.TRANSPARENT)
-        imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.TRANSPARENT)
-
-        if imgui.button(f"##{self.title}_{self.widget_name}x", (bw2, bh2)):
-            self.adapter.on_image_action(self.widget_name, "delete_image", index)
-        imgui.pop_style_color(3)
+        with transparent_button:
+            if imgui.button(self._close_id, (bw2, bh2)):
+                self.adapter.on_image_action(self.widget_name, "delete_image", index)
         if is_hovered and not self._ctx_menu_pending_open and not self._ctx_menu_active:
             imgui.push_style_var(imgui.StyleVar.WINDOW_ROUNDING, Const.CHILD_R)
             imgui.push_style_var(imgui.StyleVar.WINDOW_PADDING, (12, 12))
             imgui.begin_tooltip()
+            # 单元格只用缩略图, 悬停预览才加载原图
+            icon = TexturePool.get_tex_id(img_path)
             tex = TexturePool.get_tex(icon)
-            file_name = Path(img_path).stem
+            file_name = _file_stem(img_path)
             imgui.text(f"{file_name} [{tex.width}x{tex.height}]")
             imgui.dummy((0, imgui.get_style().frame_padding[1]))
-            canvas_tex_width = app.screen_scale * tex.width
-            canvas_tex_height = app.screen_scale * tex.height
-            canvas_width = app.screen_width * 0.7
-            canvas_height = app.screen_height * 0.7
-            if canvas_tex_width > canvas_width:
-                canvas_tex_scale = canvas_width / canvas_tex_width
-                canvas_tex_height *= canvas_tex_scale
-                canvas_tex_width *= canvas_tex_scale
-            if canvas_tex_height > canvas_height:
-                canvas_tex_scale = canvas_height / canvas_tex_height
-                canvas_tex_height *= canvas_tex_scale
-                canvas_tex_width *= canvas_tex_scale
-            aw = imgui.get_content_region_avail()[0]
-            if canvas_tex_width < aw:
-                canvas_tex_scale = aw / canvas_tex_width
-                canvas_tex_height *= canvas_tex_scale
-                canvas_tex_width *= canvas_tex_scale
+            canvas_tex_width, canvas_tex_height = _fit_preview_size(app, tex.width, tex.height)
             imgui.invisible_button("FakeButton", (canvas_tex_width, canvas_tex_height))
             pmin = imgui.get_item_rect_min()
             pmax = imgui.get_item_rect_max()
@@ -731,12 +724,12 @@ class StudioImagesDescriptor(WidgetDescriptor):
             imgui.end_tooltip()
             imgui.pop_style_var(2)
             imgui.set_cursor_pos(pos)
-            col = (67 / 255, 207 / 255, 124 / 255, 1)
+            col = Const.CLOSE_BUTTON_HOVERED
             if imgui.is_item_active():
                 col = Const.CLOSE_BUTTON_ACTIVE
             elif imgui.is_item_hovered():
                 col = Const.CLOSE_BUTTON_HOVERED
-            col = imgui.get_color_u32(col)
+            col = color_u32(col)
             icon = TexturePool.get_tex_id("close")
             dl = imgui.get_window_draw_list()
             dl.add_image(icon, imgui.get_item_rect_min(), imgui.get_item_rect_max(), col=col)
@@ -764,6 +757,9 @@ class StudioImagesDescriptor(WidgetDescriptor):
 
 
 class StudioHistoryViewer:
+    # 每条记录的子窗口/右键菜单 ID, 按 index 缓存; 查看器每帧都会重新创建, 所以放在类上
+    ITEM_IDS: dict[int, tuple[str, str]] = {}
+
     def __init__(self, app: "AIStudio", history: "StudioHistory") -> None:
         self.history = history
         self.app = app
@@ -771,6 +767,13 @@ class StudioHistoryViewer:
         self.col_widget = Const.FRAME_BG
         self.flags = DEFAULT_CHILD_FLAGS
 
+    @classmethod
+    def _get_item_ids(cls, index: int) -> tuple[str, str]:
+        ids = cls.ITEM_IDS.get(index)
+        if ids is None:
+            ids = cls.ITEM_IDS[index] = (f"##Item_{index}", f"##HistoryImageCtxMenu_{index}")
+        return ids
+
     def draw_all(self):
         for item in self.history.items:
             self._draw(item)
@@ -795,7 +798,7 @@ class StudioHistoryViewer:
         imgui.push_style_color(imgui.Col.FRAME_BG, self.col_bg)
         imgui.push_style_var_y(imgui.StyleVar.CELL_PADDING, 0)
         imgui.push_style_var_y(imgui.StyleVar.ITEM_SPACING, Const.CHILD_P[1])
-        with with_child(f"##Item_{item.index}", (0, 0), child_flags=self.flags):
+        with with_child(self._get_item_ids(item.index)[0], (0, 0), child_flags=self.flags):
             imgui.push_style_color(imgui.Col.FRAME_BG, self.col_widget)
             self._draw_header(item)
             self._draw_content(item)
@@ -1180,7 +1183,7 @@ class StudioHistoryViewer:
             imgui.table_next_column()
             img = item.get_output_file_image()
             self._draw_image_cell(img, w1, h1)
-            popup_id = f"##HistoryImageCtxMenu_{item.index}"
+            popup_id = self._get_item_ids(item.index)[1]
             if self.app.history_ctx.state.pending_open:
                 imgui.open_popup(popup_id)
                 self.app.history_ctx.state.pending_open = False
@@ -1248,7 +1251,7 @@ class StudioHistoryViewer:
             dl = imgui.get_window_draw_list()
             dl.add_image_rounded(icon, pmin, pmax, uvmin, uvmax, 0xFFFFFFFF, 12)
             if imgui.is_item_hovered() and not self.app.history_ctx.state.pending_open and not self.app.history_ctx.state.active:
-                self._draw_image_tooltip(img, icon)
+                self._draw_image_tooltip(img, icon, tex)
             if imgui.is_item_clicked(imgui.MouseButton.RIGHT):
                 self.app.history_ctx.state.image_path = img
                 self.app.history_ctx.state.pending_open = True
@@ -1256,32 +1259,15 @@ class StudioHistoryViewer:
         imgui.pop_style_var(1)
         imgui.pop_style_color(1)
 
-    def _draw_image_tooltip(self, img: str, icon) -> None:
+    def _draw_image_tooltip(self, img: str, icon, tex) -> None:
         """绘制图片悬停时的工具提示（文件名、尺寸与预览图）。"""
         imgui.push_style_var(imgui.StyleVar.WINDOW_ROUNDING, Const.CHILD_R)
         imgui.push_style_var(imgui.StyleVar.WINDOW_PADDING, (12, 12))
         imgui.begin_tooltip()
-        tex = TexturePool.get_tex(icon)
-        file_name = Path(img).stem
+        file_name = _file_stem(img)
         imgui.text(f"{file_name} [{tex.width}x{tex.height}]")
         imgui.dummy((0, 0))
-        canvas_tex_width = self.app.screen_scale * tex.width
-        canvas_tex_height = self.app.screen_scale * tex.height
-        canvas_width = self.app.screen_width * 0.7
-        canvas_height = self.app.screen_height * 0.7
-        if canvas_tex_width > canvas_width:
-            canvas_tex_scale = canvas_width / canvas_tex_width
-            canvas_tex_height *= canvas_tex_scale
-            canvas_tex_width *= canvas_tex_scale
-        if canvas_tex_height > canvas_height:
-            canvas_tex_scale = canvas_height / canvas_tex_height
-            canvas_tex_height *= canvas_tex_scale
-            canvas_tex_width *= canvas_tex_scale
-        aw = imgui.get_content_region_avail()[0]
-        if canvas_tex_width < aw:
-            canvas_tex_scale = aw / canvas_tex_width
-            canvas_tex_height *= canvas_tex_scale
-            canvas_tex_width *= canvas_tex_scale
+        canvas_tex_width, canvas_tex_height = _fit_preview_size(self.app, tex.width, tex.height)
         imgui.invisible_button("FakeButton", (canvas_tex_width, canvas_tex_height))
         pmin = imgui.get_item_rect_min()
         pmax = imgui.get_item_rect_max()
@@ -1307,10 +1293,9 @@ class StudioHistoryViewer:
                 if CustomWidgets.icon_label_button("image_edit", _T("Edit"), "LEFT", (0, bh)):
                     img = item.get_output_file_image()
                     if Path(img).exists():
-                        image = item.get_output_file_image()
                         meta = item.stringify()
                         context = bpy.context.copy()
-                        Timer.put((edit_image_with_meta_and_context, image, meta, context))
+                        Timer.put((edit_image_with_meta_and_context, img, meta, context))
                     else:
                         self.app.push_info_message(_T("Image not found! Edit Failed!"))
                 if imgui.is_item_hovered():
@@ -1321,7 +1306,7 @@ class StudioHistoryViewer:
                 if CustomWidgets.icon_label_button("image_export", _T("Save"), "LEFT", (0, bh)):
                     img = item.get_output_file_image()
                     if Path(img).exists():
-                        self.export_image(item.get_output_file_image())
+                        self.export_image(img)
                     else:
                         self.app.push_info_message(_T("Image not found! Export Failed!"))
                 if imgui.is_item_hovered():
@@ -1346,11 +1331,11 @@ class StudioHistoryViewer:
         _, _ = imgui.input_text_multiline("##prompt", prompt, (-1, text_box_height), mlt_flags)
         if not item.is_success():
             return
-        icon = TexturePool.get_tex_id(item.get_output_file_image())
-        tex = TexturePool.get_tex(icon)
+        out_img = item.get_output_file_image()
+        tex = TexturePool.get_tex(TexturePool.get_tex_id(out_img))
         tex_width = tex.width
         tex_height = tex.height
-        stem = Path(item.get_output_file_image()).stem
+        stem = _file_stem(out_img)
         icon = TexturePool.get_tex_id("roster")
         imgui.dummy((0, 0))
         imgui.image(icon, (h, h))
@@ -1370,7 +1355,7 @@ class StudioHistoryViewer:
         imgui.dummy((0, 0))
         imgui.image(icon, (h, h))
         imgui.same_line()
-        imgui.text(datetime.fromtimestamp(item.timestamp).strftime("%Y-%m-%d %H:%M:%S"))
+        imgui.text(item.get_timestamp_str())
 
     def _draw_detail_copy_id(self, item: StudioHistoryItem) -> None:
         """绘制详情展开区域：提示词文本框与图片元信息。"""
@@ -1410,8 +1395,6 @@ class StudioHistoryViewer:
             copyfile(in_file, file_path)
             print("导出图片到：", file_path)
 
-        from .ops import FileCallbackRegistry
-
         callback_id = FileCallbackRegistry.register_callback(export_image_callback)
         if not callback_id:
             self.app.push_error_message(_T("File Select Window is Busy, Close it First!"))
@@ -1464,13 +1447,17 @@ class StudioWrapper:
         return self.studio_client.model_name if self.studio_client else ""
 
     def load(self, client: UniversalClient):
+        # 每帧都会调用: 控件描述器按模型缓存, 已构建过的模型只切换当前客户端
+        model_name = client.model_name
+        if client is self.studio_client and model_name == self.model_name:
+            return
         self.studio_client = client
         self.adapter = client
-        self.display_name = client.model_name
-        self.model_name = client.model_name
-        if self.model_name in self.widgets:
+        self.display_name = model_name
+        self.model_name = model_name
+        if model_name in self.widgets:
             return
-        widgets = self.widgets.setdefault(self.model_name, {})
+        widgets = self.widgets.setdefault(model_name, {})
 
         for prop_name in client.get_properties():
             meta = client.get_meta(prop_name)
@@ -1482,7 +1469,6 @@ class StudioWrapper:
             if category not in widgets:
                 widgets[category] = []
             widgets[category].append(widget)
-        self.adapter = None
 
     def get_widgets_by_category(self, category: str):
         return self.widgets.get(self.model_name, {}).get(category, [])
@@ -1516,6 +1502,8 @@ class StorePanel:
     def __init__(self, app: "AIStudio"):
         self.app = app
         self.redeem_panel = RedeemPanel(app)
+        # 窗口位置只在第一次生效(Cond.ONCE), 之后不再遍历区域查询标题栏高度
+        self._window_pos_initialized = False
         self.init()
 
     def init(self):
@@ -1697,11 +1685,13 @@ class StorePanel:
 
     def draw_buy(self):
         window_size = 1680, 713
-        hh = get_header_panel_height() / self.app.screen_scale
-        sw = self.app.screen_width
-        sh = self.app.screen_height
-        window_pos = (sw - window_size[0]) / 2, (sh - window_size[1] + hh) / 2
-        imgui.set_next_window_pos(window_pos, imgui.Cond.ONCE)
+        if not self._window_pos_initialized:
+            self._window_pos_initialized = True
+            hh = get_header_panel_height() / self.app.screen_scale
+            sw = self.app.screen_width
+            sh = self.app.screen_height
+            window_pos = (sw - window_size[0]) / 2, (sh - window_size[1] + hh) / 2
+            imgui.set_next_window_pos(window_pos, imgui.Cond.ONCE)
         imgui.set_next_window_size(window_size, imgui.Cond.ALWAYS)
         flags = 0
         flags |= imgui.WindowFlags.NO_RESIZE
@@ -1727,27 +1717,21 @@ class StorePanel:
                 self.app.font_manager.push_h1_font()
 
                 imgui.push_style_var_y(imgui.StyleVar.FRAME_PADDING, 0)
-                imgui.push_style_color(imgui.Col.BUTTON, Const.TRANSPARENT)
-                imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.TRANSPARENT)
-                imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.TRANSPARENT)
-                imgui.button(_T("AGL STORE"))
-                imgui.same_line()
+                with transparent_button:
+                    imgui.button(_T("AGL STORE"))
+                    imgui.same_line()
 
-                icon = TexturePool.get_tex_id("settings_header")
-                tex = TexturePool.get_tex(icon)
-                scale = imgui.get_text_line_height() / tex.height
-                imgui.image_button("Buy", icon, (tex.width * scale, tex.height * scale), tint_col=Const.BUTTON_SELECTED)
-                imgui.pop_style_color(3)
+                    icon = TexturePool.get_tex_id("settings_header")
+                    tex = TexturePool.get_tex(icon)
+                    scale = imgui.get_text_line_height() / tex.height
+                    imgui.image_button("Buy", icon, (tex.width * scale, tex.height * scale), tint_col=Const.BUTTON_SELECTED)
                 imgui.same_line()
 
-                imgui.push_style_color(imgui.Col.BUTTON, Const.TRANSPARENT)
-                imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.TRANSPARENT)
-                imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.TRANSPARENT)
-                bh = imgui.get_text_line_height()
-                label = _T("The more, the cheaper.")
-                bw = imgui.calc_text_size(label)[0] + bh * 1.5
-                CustomWidgets.icon_label_button("account_warning", label, "CENTER", (bw, bh))
-                imgui.pop_style_color(3)
+                with transparent_button:
+                    bh = imgui.get_text_line_height()
+                    label = _T("The more, the cheaper.")
+                    bw = imgui.calc_text_size(label)[0] + bh * 1.5
+                    CustomWidgets.icon_label_button("account_warning", label, "CENTER", (bw, bh))
                 imgui.same_line()
 
                 h = imgui.get_frame_height()
@@ -1808,7 +1792,7 @@ class StorePanel:
         dl.add_image_rounded(tex, pmin, pmax, (0, 0), (1, 1), 0xFFFFFFFF, style.frame_rounding * 2)
 
         imgui.set_cursor_pos((screen_pos[0] + style.frame_padding[0], screen_pos[1] + style.frame_padding[1]))
-        col = imgui.get_color_u32((1, 1, 1, 1))
+        col = color_u32((1, 1, 1, 1))
         font_manager = self.app.font_manager
         # 信息1
         if True:
@@ -1838,7 +1822,7 @@ class StorePanel:
             label = f"￥{price}"
             font_manager.push_h1_font(30)
             lw, lh = imgui.calc_text_size(label)
-            col = imgui.get_color_u32((1, 1, 1, 1))
+            col = color_u32((1, 1, 1, 1))
             dl.add_text((pmin[0] + (aw - lw) * 0.5, pmax[1] - 70 + (70 - lh) * 0.5), col, label)
             font_manager.pop_font()
 
@@ -1902,24 +1886,21 @@ class RedeemPanel:
                 self.app.font_manager.push_h1_font()
 
                 imgui.push_style_var_y(imgui.StyleVar.FRAME_PADDING, 0)
-                imgui.push_style_color(imgui.Col.BUTTON, Const.TRANSPARENT)
-                imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.TRANSPARENT)
-                imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.TRANSPARENT)
-                imgui.push_style_var_x(imgui.StyleVar.FRAME_PADDING, 0)
-                imgui.button(_T("Use Redeem Code"))
-                imgui.pop_style_var(1)
-                imgui.same_line()
+                with transparent_button:
+                    imgui.push_style_var_x(imgui.StyleVar.FRAME_PADDING, 0)
+                    imgui.button(_T("Use Redeem Code"))
+                    imgui.pop_style_var(1)
+                    imgui.same_line()
 
-                icon = TexturePool.get_tex_id("redeem_header")
-                tex = TexturePool.get_tex(icon)
-                scale = imgui.get_text_line_height() / tex.height
-                imgui.image_button(
-                    "Redeem",
-                    icon,
-                    (tex.width * scale, tex.height * scale),
-                    tint_col=Const.BUTTON_SELECTED,
-                )
-                imgui.pop_style_color(3)
+                    icon = TexturePool.get_tex_id("redeem_header")
+                    tex = TexturePool.get_tex(icon)
+                    scale = imgui.get_text_line_height() / tex.height
+                    imgui.image_button(
+                        "Redeem",
+                        icon,
+                        (tex.width * scale, tex.height * scale),
+                        tint_col=Const.BUTTON_SELECTED,
+                    )
                 imgui.same_line()
 
                 h = imgui.get_frame_height()
@@ -1983,15 +1964,11 @@ class RedeemPanel:
                 self.app.font_manager.push_h1_font()
 
                 imgui.push_style_var_y(imgui.StyleVar.FRAME_PADDING, 0)
-                imgui.push_style_color(imgui.Col.BUTTON, Const.TRANSPARENT)
-                imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.TRANSPARENT)
-                imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.TRANSPARENT)
+                with transparent_button:
+                    imgui.push_style_var_x(imgui.StyleVar.FRAME_PADDING, 0)
+                    imgui.button(_T("Confirm to Redeem?"))
+                    imgui.pop_style_var(1)
 
-                imgui.push_style_var_x(imgui.StyleVar.FRAME_PADDING, 0)
-                imgui.button(_T("Confirm to Redeem?"))
-                imgui.pop_style_var(1)
-
-                imgui.pop_style_color(3)
                 imgui.same_line()
 
                 h = imgui.get_frame_height()
@@ -2058,13 +2035,10 @@ class RedeemPanel:
                 self.app.font_manager.push_h1_font()
 
                 imgui.push_style_var_y(imgui.StyleVar.FRAME_PADDING, 0)
-                imgui.push_style_color(imgui.Col.BUTTON, Const.TRANSPARENT)
-                imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.TRANSPARENT)
-                imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.TRANSPARENT)
-                imgui.push_style_var_x(imgui.StyleVar.FRAME_PADDING, 0)
-                imgui.button(_T("Redeem Success!"))
-                imgui.pop_style_var(1)
-                imgui.pop_style_color(3)
+                with transparent_button:
+                    imgui.push_style_var_x(imgui.StyleVar.FRAME_PADDING, 0)
+                    imgui.button(_T("Redeem Success!"))
+                    imgui.pop_style_var(1)
                 imgui.same_line()
 
                 h = imgui.get_frame_height()
@@ -2110,13 +2084,10 @@ class RedeemPanel:
                 self.app.font_manager.push_h1_font()
 
                 imgui.push_style_var_y(imgui.StyleVar.FRAME_PADDING, 0)
-                imgui.push_style_color(imgui.Col.BUTTON, Const.TRANSPARENT)
-                imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.TRANSPARENT)
-                imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.TRANSPARENT)
-                imgui.push_style_var_x(imgui.StyleVar.FRAME_PADDING, 0)
-                imgui.button(_T("Redeem Failed ~ QAQ"))
-                imgui.pop_style_var(1)
-                imgui.pop_style_color(3)
+                with transparent_button:
+                    imgui.push_style_var_x(imgui.StyleVar.FRAME_PADDING, 0)
+                    imgui.button(_T("Redeem Failed ~ QAQ"))
+                    imgui.pop_style_var(1)
                 imgui.same_line()
 
                 h = imgui.get_frame_height()
@@ -2333,6 +2304,51 @@ class BubbleLogger:
 
 class AIStudio(AppHud):
     CACHED_CLIENT = {}
+    # 左侧切换按钮: (面板, 图标), 按绘制顺序排列, 循环时直接解包
+    SUBPANEL_CONFIG = (
+        (AIStudioPanelType.GENERATION, "generation"),
+        (AIStudioPanelType.HISTORY, "history"),
+        (AIStudioPanelType.SETTINGS, "settings"),
+    )
+    SUBPANEL_BTN_SIZE = 40, 40
+    # 主面板的窗口标志和样式都是常量, 只在类定义时组合一次
+    WINDOW_FLAGS = (
+        imgui.WindowFlags.NO_RESIZE
+        | imgui.WindowFlags.NO_COLLAPSE
+        | imgui.WindowFlags.NO_TITLE_BAR
+        | imgui.WindowFlags.NO_SCROLL_WITH_MOUSE
+        | imgui.WindowFlags.NO_SCROLLBAR
+        | imgui.WindowFlags.NO_SAVED_SETTINGS
+    )
+    STYLE_VARS = (
+        (imgui.StyleVar.WINDOW_PADDING, Const.WINDOW_P),
+        (imgui.StyleVar.WINDOW_ROUNDING, Const.WINDOW_R),
+        (imgui.StyleVar.FRAME_PADDING, Const.FRAME_P),
+        (imgui.StyleVar.FRAME_ROUNDING, Const.RP_FRAME_R),
+        (imgui.StyleVar.CELL_PADDING, Const.RP_CELL_P),
+        (imgui.StyleVar.ITEM_SPACING, Const.ITEM_S),
+    )
+    STYLE_COLORS = (
+        (imgui.Col.WINDOW_BG, Const.RP_L_BOX_BG),
+        (imgui.Col.BUTTON, Const.BUTTON),
+        (imgui.Col.BUTTON_ACTIVE, Const.BUTTON_ACTIVE),
+        (imgui.Col.BUTTON_HOVERED, Const.BUTTON_HOVERED),
+    )
+    # 生成面板引擎选择及以下区域的样式
+    GEN_PANEL_STYLE_VARS = (
+        (imgui.StyleVar.FRAME_ROUNDING, Const.CHILD_R),
+        (imgui.StyleVar.FRAME_PADDING, Const.CHILD_P),
+        (imgui.StyleVar.FRAME_BORDER_SIZE, Const.CHILD_BS),
+        (imgui.StyleVar.POPUP_ROUNDING, 24),
+        (imgui.StyleVar.ITEM_SPACING, (8, 8)),
+    )
+    GEN_PANEL_STYLE_COLORS = (
+        (imgui.Col.FRAME_BG, Const.WINDOW_BG),
+        (imgui.Col.POPUP_BG, Const.POPUP_BG),
+        (imgui.Col.HEADER, Const.BUTTON),
+        (imgui.Col.HEADER_ACTIVE, Const.BUTTON_ACTIVE),
+        (imgui.Col.HEADER_HOVERED, Const.BUTTON_HOVERED),
+    )
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -2349,16 +2365,34 @@ class AIStudio(AppHud):
         }
         # 加载模型注册表
         self.model_registry = ModelRegistry.get_instance()
+        # 认证模式 -> 可用模型名, 注册表只在启动时加载, 结果不会变化
+        self._available_models: dict[str, tuple[str, ...]] = {}
 
         # 初始化 active_client 为默认模型 Name
         self.active_client = ""
         self._last_exception: Exception = None
         self.refresh_client()
         self.history_ctx = HistoryCtxManager()
+        # 切换按钮的图标和 ID 固定不变, 第一次绘制时解析纹理 ID
+        self._subpanel_icons: tuple[tuple[AIStudioPanelType, int, str], ...] | None = None
+        # 切换按钮各状态的颜色(u32), 需要 ImGui 上下文, 同样在第一次绘制时计算
+        self._subpanel_btn_cols: dict[str, int] | None = None
+        self._window_pos_initialized = False
+        # 拖动窗口期间工具栏宽度不变, 每次拖动只查询一次
+        self._drag_tool_panel_width: int | None = None
+        self._panel_draw_funcs = {
+            AIStudioPanelType.GENERATION: self.draw_generation_panel,
+            AIStudioPanelType.HISTORY: self.draw_history_panel,
+            AIStudioPanelType.SETTINGS: self.draw_setting_panel,
+        }
 
     def create_client_with_cache(self) -> "UniversalClient":
-        self.CACHED_CLIENT.setdefault(bpy.context.area, UniversalClient())
-        return self.CACHED_CLIENT[bpy.context.area]
+        # setdefault 会先构造一个 UniversalClient 再丢弃, 已缓存时直接返回
+        area = bpy.context.area
+        client = self.CACHED_CLIENT.get(area)
+        if client is None:
+            client = self.CACHED_CLIENT[area] = UniversalClient()
+        return client
 
     def refresh_client(self):
         available_models = self.get_available_models()
@@ -2371,22 +2405,23 @@ class AIStudio(AppHud):
         self.active_client = available_models[0]
         self.client.current_model_name = self.active_client  # 通知 Client 切换模型
 
-    def get_available_models(self) -> list[str]:
+    def get_available_models(self) -> tuple[str, ...]:
         """获取当前认证模式下可用的模型列表
 
         Returns:
             model_name列表
-            例如: ["google/NanoBananaPro", ...]
+            例如: ("google/NanoBananaPro", ...)
         """
         current_auth_mode = self.state.auth_mode
-
-        # 从注册表获取支持当前认证模式的模型
-        models = self.model_registry.list_models(
-            auth_mode=current_auth_mode,
-            category="IMAGE_GENERATION",  # 目前只显示图像生成模型
-        )
-
-        result = [model.model_name for model in models]
+        # 每帧都会调用(下拉框和设置面板), 按认证模式缓存, 不再每次遍历注册表
+        result = self._available_models.get(current_auth_mode)
+        if result is None:
+            # 从注册表获取支持当前认证模式的模型
+            models = self.model_registry.list_models(
+                auth_mode=current_auth_mode,
+                category="IMAGE_GENERATION",  # 目前只显示图像生成模型
+            )
+            result = self._available_models[current_auth_mode] = tuple(model.model_name for model in models)
         return result
 
     def calc_active_client_price(self, price_table: dict) -> int | None:
@@ -2412,7 +2447,9 @@ class AIStudio(AppHud):
 
     def handler_draw(self, _area: bpy.types.Area):
         try:
-            self.draw_studio_panel()
+            # 点击关闭后到真正关闭之前可能还会再绘制一帧, 此时不再构建窗口
+            if self.active_panel is not AIStudioPanelType.NONE:
+                self.draw_studio_panel()
             self.refresh_task_all()
         except Exception as e:
             if not _exceptions_equal(self._last_exception, e):
@@ -2422,29 +2459,21 @@ class AIStudio(AppHud):
 
     def draw_studio_panel(self):
         window_size = 540, 1359
-        ui_offset = get_pref().ui_offset
-        window_pos = (get_tool_panel_width() + ui_offset[0]) / self.screen_scale, ui_offset[1] / self.screen_scale
-        imgui.set_next_window_pos(window_pos, imgui.Cond.ONCE)
+        # 位置只在第一次生效(Cond.ONCE), 之后不再每帧遍历区域计算工具栏宽度
+        if not self._window_pos_initialized:
+            self._window_pos_initialized = True
+            ui_offset = get_pref().ui_offset
+            window_pos = (get_tool_panel_width() + ui_offset[0]) / self.screen_scale, ui_offset[1] / self.screen_scale
+            imgui.set_next_window_pos(window_pos, imgui.Cond.ONCE)
         imgui.set_next_window_size(window_size, imgui.Cond.ALWAYS)
-        flags = 0
-        flags |= imgui.WindowFlags.NO_RESIZE
-        flags |= imgui.WindowFlags.NO_COLLAPSE
-        flags |= imgui.WindowFlags.NO_TITLE_BAR
-        flags |= imgui.WindowFlags.NO_SCROLL_WITH_MOUSE
-        flags |= imgui.WindowFlags.NO_SCROLLBAR
-        flags |= imgui.WindowFlags.NO_SAVED_SETTINGS
+        flags = self.WINDOW_FLAGS
 
-        imgui.push_style_var(imgui.StyleVar.WINDOW_PADDING, Const.WINDOW_P)
-        imgui.push_style_var(imgui.StyleVar.WINDOW_ROUNDING, Const.WINDOW_R)
-        imgui.push_style_var(imgui.StyleVar.FRAME_PADDING, Const.FRAME_P)
-        imgui.push_style_var(imgui.StyleVar.FRAME_ROUNDING, Const.RP_FRAME_R)
-        imgui.push_style_var(imgui.StyleVar.CELL_PADDING, Const.RP_CELL_P)
-        imgui.push_style_var(imgui.StyleVar.ITEM_SPACING, Const.ITEM_S)
-
-        imgui.push_style_color(imgui.Col.WINDOW_BG, Const.RP_L_BOX_BG)
-        imgui.push_style_color(imgui.Col.BUTTON, Const.BUTTON)
-        imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.BUTTON_ACTIVE)
-        imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.BUTTON_HOVERED)
+        push_style_var = imgui.push_style_var
+        for var, value in self.STYLE_VARS:
+            push_style_var(var, value)
+        push_style_color = imgui.push_style_color
+        for col, value in self.STYLE_COLORS:
+            push_style_color(col, value)
 
         istyle = imgui.get_style()
         fp = istyle.frame_padding
@@ -2452,6 +2481,8 @@ class AIStudio(AppHud):
 
         imgui.begin("##AIStudioPanel", False, flags)
         self.sync_window_pos_to_pref()
+        # 左右两栏都画在主窗口的绘制列表上, 整个窗口只获取一次
+        dl = imgui.get_window_draw_list()
 
         # Error Log Bubble
         if True:
@@ -2460,46 +2491,47 @@ class AIStudio(AppHud):
         # Left
         if True:
             imgui.begin_group()
-            btn_size = 40, 40
-            subpanel_config = {
-                AIStudioPanelType.GENERATION: "generation",
-                AIStudioPanelType.HISTORY: "history",
-                AIStudioPanelType.SETTINGS: "settings",
-            }
+            btn_size = self.SUBPANEL_BTN_SIZE
             btn_size = (btn_size[0] + fp[0] * 2, btn_size[1] + fp[1] * 2)
-            for subpanel in subpanel_config:
-                if subpanel == AIStudioPanelType.SETTINGS:
+            if self._subpanel_icons is None:
+                self._subpanel_icons = tuple((p, TexturePool.get_tex_id(n), f"##Btn{p}") for p, n in self.SUBPANEL_CONFIG)
+            subpanel_icons = self._subpanel_icons
+            if self._subpanel_btn_cols is None:
+                self._subpanel_btn_cols = {
+                    "normal": imgui.get_color_u32(Const.CLOSE_BUTTON_NORMAL),
+                    "active": imgui.get_color_u32(Const.BUTTON_ACTIVE),
+                    "hovered": imgui.get_color_u32(Const.CLOSE_BUTTON_HOVERED),
+                    "selected": imgui.get_color_u32(Const.BUTTON_SELECTED),
+                }
+            btn_cols = self._subpanel_btn_cols
+            for subpanel, icon, btn_id in subpanel_icons:
+                if subpanel is AIStudioPanelType.SETTINGS:
                     imgui.invisible_button("##Dummy", (1, -(btn_size[1] + item_spacing[1])))
                     pos = imgui.get_cursor_pos()
 
                     self.font_manager.push_h5_font(12 * Const.SCALE)
                     line_height = imgui.get_text_line_height_with_spacing()
                     imgui.set_cursor_pos_y(pos[1] - item_spacing[1] - line_height)
-                    imgui.push_style_color(imgui.Col.BUTTON, Const.TRANSPARENT)
-                    imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.TRANSPARENT)
-                    imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.TRANSPARENT)
-                    imgui.button(f"V{'.'.join(map(str, get_addon_version()))}")
-                    imgui.pop_style_color(3)
+                    with transparent_button:
+                        imgui.button(f"V{'.'.join(map(str, get_addon_version()))}")
                     self.font_manager.pop_font()
 
                     imgui.set_cursor_pos_y(pos[1])
 
-                icon = TexturePool.get_tex_id(subpanel_config[subpanel])
-                if imgui.button(f"##Btn{subpanel}", btn_size):
+                if imgui.button(btn_id, btn_size):
                     self.active_panel = subpanel
-                col = Const.CLOSE_BUTTON_NORMAL
-                if imgui.is_item_active():
-                    col = Const.BUTTON_ACTIVE
+                if subpanel is self.active_panel:
+                    col = btn_cols["selected"]
+                elif imgui.is_item_active():
+                    col = btn_cols["active"]
                 elif imgui.is_item_hovered():
-                    col = Const.CLOSE_BUTTON_HOVERED
-                if subpanel == self.active_panel:
-                    col = Const.BUTTON_SELECTED
-                col = imgui.get_color_u32(col)
-                dl = imgui.get_window_draw_list()
-                pmin = imgui.get_item_rect_min()
-                pmin = pmin[0] + fp[0], pmin[1] + fp[1]
-                pmax = imgui.get_item_rect_max()
-                pmax = pmax[0] - fp[0], pmax[1] - fp[1]
+                    col = btn_cols["hovered"]
+                else:
+                    col = btn_cols["normal"]
+                # 按钮尺寸固定为 btn_size, 右下角由左上角推出, 少一次 get_item_rect_max 调用
+                x, y = imgui.get_item_rect_min()
+                pmin = x + fp[0], y + fp[1]
+                pmax = x + btn_size[0] - fp[0], y + btn_size[1] - fp[1]
                 dl.add_image(icon, pmin, pmax, col=col)
 
             imgui.end_group()
@@ -2515,12 +2547,10 @@ class AIStudio(AppHud):
 
             lt = wx + cx, wy + 0
             rb = wx + ww, wy + wh
-            col = imgui.get_color_u32(Const.RP_R_BOX_BG)
+            col = color_u32(Const.RP_R_BOX_BG)
             r = Const.LP_WINDOW_R + 4
-            dl = imgui.get_window_draw_list()
             dl.add_rect_filled(lt, rb, col, r, imgui.DrawFlags.ROUND_CORNERS_RIGHT)
 
-            fp = istyle.frame_padding
             imgui.push_style_color(imgui.Col.FRAME_BG, Const.TRANSPARENT)
             imgui.push_style_var(imgui.StyleVar.FRAME_PADDING, Const.LP_WINDOW_P)
             if True:
@@ -2530,9 +2560,9 @@ class AIStudio(AppHud):
                 imgui.push_id("##RightInner")
 
                 imgui.begin_group()
-                self.draw_generation_panel()
-                self.draw_history_panel()
-                self.draw_setting_panel()
+                # 只调用当前激活的面板
+                if draw_panel := self._panel_draw_funcs.get(self.active_panel):
+                    draw_panel()
                 imgui.end_group()
 
                 imgui.pop_id()
@@ -2544,16 +2574,19 @@ class AIStudio(AppHud):
             imgui.end_group()
 
         imgui.end()
-        imgui.pop_style_var(6)
-        imgui.pop_style_color(4)
+        imgui.pop_style_var(len(self.STYLE_VARS))
+        imgui.pop_style_color(len(self.STYLE_COLORS))
 
     def sync_window_pos_to_pref(self):
         # Record Window Position
-        if imgui.is_window_hovered() and self.is_mouse_dragging():
-            pos = imgui.get_window_pos()
-            tool_panel_width = get_tool_panel_width()
-            offset = pos[0] * self.screen_scale - tool_panel_width, pos[1] * self.screen_scale
-            get_pref().set_ui_offset(offset)
+        if not (imgui.is_window_hovered() and self.is_mouse_dragging()):
+            self._drag_tool_panel_width = None
+            return
+        if self._drag_tool_panel_width is None:
+            self._drag_tool_panel_width = get_tool_panel_width()
+        pos = imgui.get_window_pos()
+        offset = pos[0] * self.screen_scale - self._drag_tool_panel_width, pos[1] * self.screen_scale
+        get_pref().set_ui_offset(offset)
 
     def draw_and_update_error_log(self):
         for error in self.client.take_errors():
@@ -2563,24 +2596,19 @@ class AIStudio(AppHud):
         self.bubble_logger.draw_and_update()
 
     def draw_generation_panel(self):
-        if self.active_panel != AIStudioPanelType.GENERATION:
-            return
         dummy_size = 0, 26 / 2
         imgui.push_style_var_x(imgui.StyleVar.CELL_PADDING, Const.LP_CELL_P[0])
         imgui.push_style_var_y(imgui.StyleVar.ITEM_SPACING, 0)
 
         if True:
             self.font_manager.push_h1_font()
-            imgui.push_style_color(imgui.Col.BUTTON, Const.TRANSPARENT)
-            imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.TRANSPARENT)
-            imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.TRANSPARENT)
-            imgui.button(_T("AI STUDIO"))
-            imgui.same_line()
-            icon = TexturePool.get_tex_id("lite_header")
-            tex = TexturePool.get_tex(icon)
-            scale = imgui.get_text_line_height() / tex.height
-            imgui.image_button("", icon, (tex.width * scale, tex.height * scale), tint_col=Const.BUTTON_SELECTED)
-            imgui.pop_style_color(3)
+            with transparent_button:
+                imgui.button(_T("AI STUDIO"))
+                imgui.same_line()
+                icon = TexturePool.get_tex_id("lite_header")
+                tex = TexturePool.get_tex(icon)
+                scale = imgui.get_text_line_height() / tex.height
+                imgui.image_button("", icon, (tex.width * scale, tex.height * scale), tint_col=Const.BUTTON_SELECTED)
             imgui.same_line()
             self.draw_panel_close_button()
             self.font_manager.pop_font()
@@ -2599,15 +2627,12 @@ class AIStudio(AppHud):
 
             # 小字
             imgui.table_next_column()
-            imgui.push_style_color(imgui.Col.BUTTON, Const.TRANSPARENT)
-            imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.TRANSPARENT)
-            imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.TRANSPARENT)
-            imgui.push_style_var_y(imgui.StyleVar.BUTTON_TEXT_ALIGN, 0)
-            imgui.push_font(None, 12 * Const.SCALE)
-            imgui.button("Engine")
-            imgui.pop_font()
-            imgui.pop_style_var()
-            imgui.pop_style_color(3)
+            with transparent_button:
+                imgui.push_style_var_y(imgui.StyleVar.BUTTON_TEXT_ALIGN, 0)
+                imgui.push_font(None, 12 * Const.SCALE)
+                imgui.button("Engine")
+                imgui.pop_font()
+                imgui.pop_style_var()
 
             imgui.table_next_column()
             imgui.text("")
@@ -2619,17 +2644,12 @@ class AIStudio(AppHud):
             imgui.dummy((dummy_size[0], dummy_size[1] - 8))
 
             imgui.push_style_var_y(imgui.StyleVar.WINDOW_PADDING, 24)
-            imgui.push_style_var(imgui.StyleVar.FRAME_ROUNDING, Const.CHILD_R)
-            imgui.push_style_var(imgui.StyleVar.FRAME_PADDING, Const.CHILD_P)
-            imgui.push_style_var(imgui.StyleVar.FRAME_BORDER_SIZE, Const.CHILD_BS)
-            imgui.push_style_var(imgui.StyleVar.POPUP_ROUNDING, 24)
-            imgui.push_style_var(imgui.StyleVar.ITEM_SPACING, (8, 8))
-
-            imgui.push_style_color(imgui.Col.FRAME_BG, Const.WINDOW_BG)
-            imgui.push_style_color(imgui.Col.POPUP_BG, Const.POPUP_BG)
-            imgui.push_style_color(imgui.Col.HEADER, Const.BUTTON)
-            imgui.push_style_color(imgui.Col.HEADER_ACTIVE, Const.BUTTON_ACTIVE)
-            imgui.push_style_color(imgui.Col.HEADER_HOVERED, Const.BUTTON_HOVERED)
+            push_style_var = imgui.push_style_var
+            for var, value in self.GEN_PANEL_STYLE_VARS:
+                push_style_var(var, value)
+            push_style_color = imgui.push_style_color
+            for col, value in self.GEN_PANEL_STYLE_COLORS:
+                push_style_color(col, value)
 
             if True:
                 self.draw_clients()
@@ -2642,16 +2662,18 @@ class AIStudio(AppHud):
             always_vscroll = imgui.WindowFlags.ALWAYS_VERTICAL_SCROLLBAR
             with with_child("Outer", (0, -(gen_btn_height + item_spacing[1])), flags, window_flags=always_vscroll):
                 wrapper = self.client_wrapper
-                wrapper.load(self.client)  # TODO: 性能改进
+                wrapper.load(self.client)  # 控件已按模型缓存, 模型未切换时直接返回
 
+                # 绑定方法每次访问都会新建, 循环外取一次
+                display_end_cb = self.custom_widget_display_end
                 for widget in wrapper.get_widgets_by_category("Input"):
                     if not widget.is_visible():
                         continue
                     widget.col_bg = Const.WINDOW_BG
                     widget.col_widget = Const.FRAME_BG
-                    widget.add_custom_display_end(self.custom_widget_display_end)
+                    widget.add_custom_display_end(display_end_cb)
                     widget.display(wrapper, self)
-                    widget.remove_custom_display_end(self.custom_widget_display_end)
+                    widget.remove_custom_display_end(display_end_cb)
 
                 # 从 wrapper 获取 client，如果 wrapper 是默认的，则使用 self.client
                 if wrapper.studio_client is not None:
@@ -2694,15 +2716,15 @@ class AIStudio(AppHud):
                 icon = TexturePool.get_tex_id(icon_name)
                 dl = imgui.get_window_draw_list()
                 dl.add_image(icon, pmin, (pmin[0] + (pmax[1] - pmin[1]), pmax[1]))
-                col = imgui.get_color_u32((1, 1, 1, 1))
+                col = color_u32((1, 1, 1, 1))
                 dl.add_text((pmin[0] + 30, pmin[1]), col, label)
                 self.font_manager.pop_font()
 
                 imgui.pop_style_var(2)
                 imgui.pop_style_color(3)
 
-            imgui.pop_style_var(6)
-            imgui.pop_style_color(5)
+            imgui.pop_style_var(len(self.GEN_PANEL_STYLE_VARS) + 1)
+            imgui.pop_style_color(len(self.GEN_PANEL_STYLE_COLORS))
 
         imgui.pop_style_var(2)
 
@@ -2754,24 +2776,19 @@ class AIStudio(AppHud):
         imgui.pop_style_color(1)
 
     def draw_history_panel(self):
-        if self.active_panel != AIStudioPanelType.HISTORY:
-            return
         dummy_size = 0, 26 / 2
         imgui.push_style_var_x(imgui.StyleVar.CELL_PADDING, Const.LP_CELL_P[0])
         imgui.push_style_var_y(imgui.StyleVar.ITEM_SPACING, 0)
 
         if True:
             self.font_manager.push_h1_font()
-            imgui.push_style_color(imgui.Col.BUTTON, Const.TRANSPARENT)
-            imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.TRANSPARENT)
-            imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.TRANSPARENT)
-            imgui.button(_T("Gen"))
-            imgui.same_line()
-            icon = TexturePool.get_tex_id("history_header")
-            tex = TexturePool.get_tex(icon)
-            scale = imgui.get_text_line_height() / tex.height
-            imgui.image_button("", icon, (tex.width * scale, tex.height * scale), tint_col=Const.BUTTON_SELECTED)
-            imgui.pop_style_color(3)
+            with transparent_button:
+                imgui.button(_T("Gen"))
+                imgui.same_line()
+                icon = TexturePool.get_tex_id("history_header")
+                tex = TexturePool.get_tex(icon)
+                scale = imgui.get_text_line_height() / tex.height
+                imgui.image_button("", icon, (tex.width * scale, tex.height * scale), tint_col=Const.BUTTON_SELECTED)
             imgui.same_line()
             self.draw_panel_close_button()
             self.font_manager.pop_font()
@@ -2790,15 +2807,12 @@ class AIStudio(AppHud):
 
             # 小字
             imgui.table_next_column()
-            imgui.push_style_color(imgui.Col.BUTTON, Const.TRANSPARENT)
-            imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.TRANSPARENT)
-            imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.TRANSPARENT)
-            imgui.push_style_var_y(imgui.StyleVar.BUTTON_TEXT_ALIGN, 0)
-            imgui.push_font(None, 12 * Const.SCALE)
-            imgui.button("List")
-            imgui.pop_font()
-            imgui.pop_style_var()
-            imgui.pop_style_color(3)
+            with transparent_button:
+                imgui.push_style_var_y(imgui.StyleVar.BUTTON_TEXT_ALIGN, 0)
+                imgui.push_font(None, 12 * Const.SCALE)
+                imgui.button("List")
+                imgui.pop_font()
+                imgui.pop_style_var()
 
             imgui.table_next_column()
             imgui.text("")
@@ -2838,24 +2852,19 @@ class AIStudio(AppHud):
         imgui.pop_style_var(2)
 
     def draw_setting_panel(self):
-        if self.active_panel != AIStudioPanelType.SETTINGS:
-            return
         dummy_size = 0, 26 / 2
         imgui.push_style_var_x(imgui.StyleVar.CELL_PADDING, Const.LP_CELL_P[0])
         imgui.push_style_var_y(imgui.StyleVar.ITEM_SPACING, 0)
 
         if True:
             self.font_manager.push_h1_font()
-            imgui.push_style_color(imgui.Col.BUTTON, Const.TRANSPARENT)
-            imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.TRANSPARENT)
-            imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.TRANSPARENT)
-            imgui.button(_T("User"))
-            imgui.same_line()
-            icon = TexturePool.get_tex_id("settings_header")
-            tex = TexturePool.get_tex(icon)
-            scale = imgui.get_text_line_height() / tex.height
-            imgui.image_button("", icon, (tex.width * scale, tex.height * scale), tint_col=Const.BUTTON_SELECTED)
-            imgui.pop_style_color(3)
+            with transparent_button:
+                imgui.button(_T("User"))
+                imgui.same_line()
+                icon = TexturePool.get_tex_id("settings_header")
+                tex = TexturePool.get_tex(icon)
+                scale = imgui.get_text_line_height() / tex.height
+                imgui.image_button("", icon, (tex.width * scale, tex.height * scale), tint_col=Const.BUTTON_SELECTED)
             imgui.same_line()
             self.draw_panel_close_button()
             self.font_manager.pop_font()
@@ -2874,15 +2883,12 @@ class AIStudio(AppHud):
 
             # 小字
             imgui.table_next_column()
-            imgui.push_style_color(imgui.Col.BUTTON, Const.TRANSPARENT)
-            imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.TRANSPARENT)
-            imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.TRANSPARENT)
-            imgui.push_style_var_y(imgui.StyleVar.BUTTON_TEXT_ALIGN, 0)
-            imgui.push_font(None, 12 * Const.SCALE)
-            imgui.button("API")
-            imgui.pop_font()
-            imgui.pop_style_var()
-            imgui.pop_style_color(3)
+            with transparent_button:
+                imgui.push_style_var_y(imgui.StyleVar.BUTTON_TEXT_ALIGN, 0)
+                imgui.push_font(None, 12 * Const.SCALE)
+                imgui.button("API")
+                imgui.pop_font()
+                imgui.pop_style_var()
 
             imgui.table_next_column()
             imgui.text("")
@@ -2922,11 +2928,8 @@ class AIStudio(AppHud):
             self.font_manager.push_h1_font()
             for misc in ["Disclaimers", "Feedback", "Community"]:
                 imgui.push_id(misc)
-                imgui.push_style_color(imgui.Col.BUTTON, Const.TRANSPARENT)
-                imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.TRANSPARENT)
-                imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.TRANSPARENT)
-                imgui.button(_T(misc))
-                imgui.pop_style_color(3)
+                with transparent_button:
+                    imgui.button(_T(misc))
 
                 imgui.same_line()
 
@@ -2984,7 +2987,7 @@ class AIStudio(AppHud):
         icon = TexturePool.get_tex_id("help")
         dl = imgui.get_window_draw_list()
         dl.add_image(icon, pmin, (pmin[0] + icon_size, pmax[1]))
-        col = imgui.get_color_u32(Const.BUTTON_SELECTED)
+        col = color_u32(Const.BUTTON_SELECTED)
         dl.add_text((pmin[0] + icon_size, pmin[1]), col, label)
 
         self.font_manager.pop_font()
@@ -3078,18 +3081,15 @@ class AIStudio(AppHud):
                     # 为每个模型使用独立的子窗口名，避免 ID 冲突
                     with with_child(f"Inner_{model_name}", (0, 0), flags):
                         # --- 标题: 名称 + 导航按钮 ---
-                        imgui.push_style_color(imgui.Col.BUTTON, Const.TRANSPARENT)
-                        imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.TRANSPARENT)
-                        imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.TRANSPARENT)
-                        aw = imgui.get_content_region_avail()[0]
-                        bh = imgui.get_text_line_height_with_spacing()
-                        bw = aw - bh - imgui.get_style().item_spacing[0]
-                        imgui.push_style_var_x(imgui.StyleVar.BUTTON_TEXT_ALIGN, 0)
-                        self.font_manager.push_h3_font()
-                        imgui.button(wrapper.display_name, (bw, bh))
-                        self.font_manager.pop_font()
-                        imgui.pop_style_var(1)
-                        imgui.pop_style_color(3)
+                        with transparent_button:
+                            aw = imgui.get_content_region_avail()[0]
+                            bh = imgui.get_text_line_height_with_spacing()
+                            bw = aw - bh - imgui.get_style().item_spacing[0]
+                            imgui.push_style_var_x(imgui.StyleVar.BUTTON_TEXT_ALIGN, 0)
+                            self.font_manager.push_h3_font()
+                            imgui.button(wrapper.display_name, (bw, bh))
+                            self.font_manager.pop_font()
+                            imgui.pop_style_var(1)
 
                         imgui.same_line()
 
@@ -3198,7 +3198,7 @@ class AIStudio(AppHud):
                 text = _T(item.display_name)
                 text_size = imgui.calc_text_size(text)
                 text_pos = pmin[0] + (psize[0] - text_size[0]) * 0.5, pmin[1] + (psize[1] - text_size[1]) * 0.5
-                dl.add_text(text_pos, imgui.get_color_u32(Const.TEXT), text)
+                dl.add_text(text_pos, color_u32(Const.TEXT), text)
 
                 if item != items[-1]:
                     imgui.same_line()
@@ -3261,7 +3261,7 @@ class AIStudio(AppHud):
             # 文字2
             if True:
                 text_y = screen_pos[1] + (height - text_size2[1]) / 2
-                col = imgui.get_color_u32(Const.BUTTON_SELECTED)
+                col = color_u32(Const.BUTTON_SELECTED)
                 dl.add_text(self.font_manager.heavy_font, imgui.get_font_size(), (text_x, text_y), col, text2)
 
             text_x += text_size2[0]
@@ -3397,12 +3397,9 @@ class AIStudio(AppHud):
             lh = imgui.get_text_line_height() * 0.75
             imgui.invisible_button("##FakeButton", (-lh * 1.5 - wp[0], 1))
             imgui.same_line()
-            imgui.push_style_color(imgui.Col.BUTTON, Const.TRANSPARENT)
-            imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.TRANSPARENT)
-            imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.TRANSPARENT)
-            if imgui.button("##Switcher", (lh * 1.5, lh)):
-                wrapper.studio_client.use_internal_prompt ^= True
-            imgui.pop_style_color(3)
+            with transparent_button:
+                if imgui.button("##Switcher", (lh * 1.5, lh)):
+                    wrapper.studio_client.use_internal_prompt ^= True
             dl = imgui.get_window_draw_list()
             pmin = imgui.get_item_rect_min()
             pmax = imgui.get_item_rect_max()
@@ -3539,23 +3536,7 @@ class AIStudio(AppHud):
                 file_name = image.stem
                 imgui.text(f"{file_name} [{tex.width}x{tex.height}]")
                 imgui.dummy((0, 0))
-                canvas_tex_width = self.screen_scale * tex.width
-                canvas_tex_height = self.screen_scale * tex.height
-                canvas_width = self.screen_width * 0.7
-                canvas_height = self.screen_height * 0.7
-                if canvas_tex_width > canvas_width:
-                    canvas_tex_scale = canvas_width / canvas_tex_width
-                    canvas_tex_height *= canvas_tex_scale
-                    canvas_tex_width *= canvas_tex_scale
-                if canvas_tex_height > canvas_height:
-                    canvas_tex_scale = canvas_height / canvas_tex_height
-                    canvas_tex_height *= canvas_tex_scale
-                    canvas_tex_width *= canvas_tex_scale
-                aw = imgui.get_content_region_avail()[0]
-                if canvas_tex_width < aw:
-                    canvas_tex_scale = aw / canvas_tex_width
-                    canvas_tex_height *= canvas_tex_scale
-                    canvas_tex_width *= canvas_tex_scale
+                canvas_tex_width, canvas_tex_height = _fit_preview_size(self, tex.width, tex.height)
                 imgui.invisible_button("FakeButton", (canvas_tex_width, canvas_tex_height))
                 pmin = imgui.get_item_rect_min()
                 pmax = imgui.get_item_rect_max()
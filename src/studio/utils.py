@@ -9,7 +9,7 @@ from ..logger import logger
 from ..timer import Timer
 
 
-def save_mime_typed_datas_to_temp_files(mime_typed_datas: list[tuple[str, str | bytes]]) -> list[tuple[str, str]]:
+def save_mime_typed_datas_to_temp_files(mime_typed_datas: list[tuple[str, str | bytes | bytearray]]) -> list[tuple[str, str]]:
     """保存 MIME 类型数据到临时文件
 
     Args:
@@ -31,7 +31,8 @@ def save_mime_typed_datas_to_temp_files(mime_typed_datas: list[tuple[str, str |
         else:
             save_file = Path(temp_folder, f"Gen_{time_str}{ext}")
 
-        if isinstance(data, bytes):
+        # 解码结果可能是 bytes/bytearray/memoryview, 直接写出不再转换为 bytes
+        if isinstance(data, (bytes, bytearray, memoryview)):
             save_file.write_bytes(data)
         elif isinstance(data, str):
             save_file.write_text(data, encoding="utf-8")
@@ -11,9 +11,13 @@ from slimgui import imgui
 from .gui.app.app import App
 from .gui.app.style import Const
 from .gui.texture import TexturePool
-from .gui.widgets import with_child, DEFAULT_CHILD_FLAGS
+from .gui.widgets import color_u32, with_child, transparent_button, DEFAULT_CHILD_FLAGS
 from ..logger import logger
 
+# 高度拖拽手柄的悬停/常态颜色, 由激活色按比例变暗
+_GRIP_HOVERED = Const.BUTTON_ACTIVE[0] * 0.8, Const.BUTTON_ACTIVE[1] * 0.8, Const.BUTTON_ACTIVE[2] * 0.8, 1
+_GRIP_NORMAL = Const.BUTTON_ACTIVE[0] * 0.7, Const.BUTTON_ACTIVE[1] * 0.7, Const.BUTTON_ACTIVE[2] * 0.7, 1
+
 
 class PropertyType(Enum):
     NONE = "NONE"
@@ -64,6 +68,8 @@ class WidgetDescriptor:
         self.flags = DEFAULT_CHILD_FLAGS
         self._custom_display_begin: Dict[Callable[[], None], None] = {}
         self._custom_display_end: Dict[Callable[[], None], None] = {}
+        # display_begin 每帧都要 push_id, 只格式化一次
+        self._push_id = f"{self.title}_{self.widget_name}"
 
     @property
     def display_name(self):
@@ -163,7 +169,7 @@ class WidgetDescriptor:
             cb(self, wrapper, app)
 
     def display_begin(self, wrapper, app: App):
-        imgui.push_id(f"{self.title}_{self.widget_name}")
+        imgui.push_id(self._push_id)
         imgui.push_style_color(imgui.Col.FRAME_BG, self.col_bg)
 
     def display(self, wrapper, app: App):
@@ -444,13 +450,11 @@ class StringDescriptor(WidgetDescriptor):
 
         # 按钮配色：正常 / 悬停 / 激活（拖拽中）
         if is_dragging:
-            grip_color = imgui.get_color_u32(Const.BUTTON_ACTIVE)
+            grip_color = color_u32(Const.BUTTON_ACTIVE)
         elif is_hovered:
-            hover = Const.BUTTON_ACTIVE[0] * 0.8, Const.BUTTON_ACTIVE[1] * 0.8, Const.BUTTON_ACTIVE[2] * 0.8, 1
-            grip_color = imgui.get_color_u32(hover)
+            grip_color = color_u32(_GRIP_HOVERED)
         else:
-            normal = Const.BUTTON_ACTIVE[0] * 0.7, Const.BUTTON_ACTIVE[1] * 0.7, Const.BUTTON_ACTIVE[2] * 0.7, 1
-            grip_color = imgui.get_color_u32(normal)
+            grip_color = color_u32(_GRIP_NORMAL)
 
         style = imgui.get_style()
         old_aa_fill = style.anti_aliased_fill
@@ -488,6 +492,14 @@ class StringDescriptor(WidgetDescriptor):
 class ImageDescriptor(WidgetDescriptor):
     ptype: PropertyType = PropertyType.IMAGE
 
+    def __init__(self, widget_name: str, owner: Any):
+        super().__init__(widget_name, owner)
+        # 按钮/弹窗 ID 每帧都要用到, 只格式化一次
+        self._btn_id = f"##{self.title}_{self.widget_name}1"
+        self._close_id = f"##{self.title}_{self.widget_name}x"
+        self._edit_popup_id = f"##{self.title}_{self.widget_name}_edit"
+        self._inner_push_id = f"##Prop_{self.title}_{self.widget_name}_1"
+
     def _calc_window_title(self) -> str:
         return "##Image"
 
@@ -497,7 +509,7 @@ class ImageDescriptor(WidgetDescriptor):
         imgui.push_style_color(imgui.Col.FRAME_BG, self.col_widget)
         with with_child("##Inner", (0, 0), child_flags=self.flags):
             imgui.push_style_var_x(imgui.StyleVar.CELL_PADDING, 0)
-            imgui.push_id(f"##Prop_{self.title}_{self.widget_name}_1")
+            imgui.push_id(self._inner_push_id)
             self.display_image_with_close()
             imgui.pop_id()
             imgui.pop_style_var(1)
@@ -510,16 +522,13 @@ class ImageDescriptor(WidgetDescriptor):
         if not img_path or not Path(str(img_path)).exists():
             img_path = "image_new"
             has_image = False
-        icon = TexturePool.get_tex_id(img_path)
-        tex = TexturePool.get_tex(icon)
-        fbw = tex.width / max(tex.width, tex.height) if tex else 1
-        fbh = tex.height / max(tex.width, tex.height) if tex else 1
+        icon, fbw, fbh = TexturePool.get_tex_aspect(img_path, thumbnail=True)
         imgui.begin_group()
         imgui.set_next_item_allow_overlap()
         imgui.push_style_color(imgui.Col.BUTTON, Const.BUTTON)
         imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.BUTTON_ACTIVE)
         imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.BUTTON_HOVERED)
-        clicked = imgui.button(f"##{self.title}_{self.widget_name}1", (bw * fbw, bh * fbh))
+        clicked = imgui.button(self._btn_id, (bw * fbw, bh * fbh))
         pmin = imgui.get_item_rect_min()
         pmax = imgui.get_item_rect_max()
         dl = imgui.get_window_draw_list()
@@ -528,7 +537,7 @@ class ImageDescriptor(WidgetDescriptor):
         if clicked:
             pos = imgui.get_mouse_pos()
             imgui.set_next_window_pos((pos[0] - 40, pos[1] + 50), cond=imgui.Cond.ALWAYS)
-            imgui.open_popup(f"##{self.title}_{self.widget_name}_edit")
+            imgui.open_popup(self._edit_popup_id)
         if has_image:
             imgui.same_line()
             pos = imgui.get_cursor_pos()
@@ -536,20 +545,16 @@ class ImageDescriptor(WidgetDescriptor):
             isx = imgui.get_style().item_spacing[0]
             imgui.set_cursor_pos((pos[0] - isx - bw2 / 2, pos[1] - bh2 / 2 + 9))
 
-            imgui.push_style_color(imgui.Col.BUTTON, Const.TRANSPARENT)
-            imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.TRANSPARENT)
-            imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.TRANSPARENT)
-
-            if imgui.button(f"##{self.title}_{self.widget_name}x", (bw2, bh2)):
-                self.adapter.on_image_action(self.widget_name, "delete_image")
-            imgui.pop_style_color(3)
+            with transparent_button:
+                if imgui.button(self._close_id, (bw2, bh2)):
+                    self.adapter.on_image_action(self.widget_name, "delete_image")
             imgui.set_cursor_pos(pos)
             col = Const.SLIDER_NORMAL
             if imgui.is_item_active():
                 col = Const.CLOSE_BUTTON_ACTIVE
             elif imgui.is_item_hovered():
                 col = Const.CLOSE_BUTTON_HOVERED
-            col = imgui.get_color_u32(col)
+            col = color_u32(col)
             icon = TexturePool.get_tex_id("close")
             dl = imgui.get_window_draw_list()
             dl.add_image(icon, imgui.get_item_rect_min(), imgui.get_item_rect_max(), col=col)
@@ -570,7 +575,7 @@ class ImageDescriptor(WidgetDescriptor):
         imgui.push_style_color(imgui.Col.BUTTON, Const.TRANSPARENT)
         imgui.push_style_color(imgui.Col.BUTTON_ACTIVE, Const.BUTTON_ACTIVE)
         imgui.push_style_color(imgui.Col.BUTTON_HOVERED, Const.BUTTON)
-        if imgui.begin_popup(f"##{self.title}_{self.widget_name}_edit"):
+        if imgui.begin_popup(self._edit_popup_id):
             btn_types = [
                 "image_from_mat",
                 "image_from_file",
@@ -587,7 +592,7 @@ class ImageDescriptor(WidgetDescriptor):
                 size = imgui.get_item_rect_size()
                 ipos = imgui.get_item_rect_min()
                 pos = ipos[0] + (size[0] - img_s) / 2, ipos[1] + (size[1] - img_s) / 2
-                color = imgui.get_color_u32((1, 1, 1, 1))
+                color = color_u32((1, 1, 1, 1))
                 icon = TexturePool.get_tex_id(btn_type)
                 dl = imgui.get_window_draw_list()
                 dl.add_image(icon, pos, (pos[0] + img_s, pos[1] + img_s), col=color)
@@ -6,6 +6,8 @@ def load_post(a, b):
     """在加载新文件及打开blender的时候"""
     from .studio.clients.base import StudioHistory
     from .studio.ops import AIStudioEntry
+    from .utils import clear_base64_cache
+    clear_base64_cache()
     StudioHistory.thread_restore_history()
     AIStudioEntry.close_all()  # 如果打开了新场景操作符会停止
 
@@ -16,5 +18,7 @@ def register():
 
 
 def unregister():
+    from .utils import clear_base64_cache
     if load_post in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.remove(load_post)
+    clear_base64_cache()
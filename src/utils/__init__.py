@@ -1,13 +1,15 @@
 import bpy
-import base64
+import binascii
 import hashlib
-import OpenImageIO as oiio
+import mmap
 import os
 import sys
 import time
 import uuid
+from collections import OrderedDict
 from functools import cache
 from pathlib import Path
+from threading import Lock
 from typing import TYPE_CHECKING
 
 from .pkg_installer import PkgInstaller
@@ -35,6 +37,8 @@ __all__ = [
     "check_folder_writable_permission",
     "check_cache_folder_writable_permission",
     "image_file_to_base64",
+    "file_to_base64",
+    "clear_base64_cache",
     "get_edit_main_image",
 ]
 
@@ -198,6 +202,9 @@ def time_diff_to_str(time_diff=None, start=None, end=None):
 
 
 def get_image_size(filepath: str) -> tuple[float, float] | None:
+    # OpenImageIO 只在这里用到, 延迟导入, 避免请求构建/解析的导入链加载 OIIO
+    import OpenImageIO as oiio
+
     img_buf = oiio.ImageBuf(filepath)
     if not img_buf.initialized:
         return None
@@ -390,10 +397,98 @@ def start_blender(step=1):
     subprocess.Popen(args)
 
 
+try:
+    # 可选依赖: pybase64 使用 SIMD 实现, 大图编码速度是标准库的数倍
+    from pybase64 import b64encode as _b64encode_chunk
+except ImportError:
+    def _b64encode_chunk(data) -> bytes:
+        return binascii.b2a_base64(data, newline=False)
+
+
+# 3的倍数, 分块编码时块之间不会产生填充
+_BASE64_CHUNK_SIZE = 3 * 256 * 1024
+
+# 超过该大小的文件使用 mmap, 由系统直接分页读入, 小文件一次读取更快
+_BASE64_MMAP_MIN_SIZE = 1 << 20
+
+
+# (路径, 修改时间, 大小, 前缀) -> base64, 按编码结果的总长度限制, 一张 4K 图就有几十 MB
+_base64_cache: OrderedDict[tuple[str, int, int, str], str] = OrderedDict()
+_BASE64_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_base64_cache_bytes = 0
+_base64_cache_lock = Lock()
+
+
+def _encode_file_base64(file_path: str, mtime_ns: int, size: int, prefix: str) -> str:
+    """mtime_ns 与 size 仅作为缓存键, 文件被修改后自动失效"""
+    global _base64_cache_bytes
+    key = file_path, mtime_ns, size, prefix
+    with _base64_cache_lock:  # 构建请求在任务线程中进行
+        if (cached := _base64_cache.get(key)) is not None:
+            _base64_cache.move_to_end(key)
+            return cached
+
+    image_base64 = _read_file_base64(file_path, size, prefix)
+    if len(image_base64) > _BASE64_CACHE_MAX_BYTES:
+        return image_base64
+    with _base64_cache_lock:
+        if key not in _base64_cache:
+            _base64_cache[key] = image_base64
+            _base64_cache_bytes += len(image_base64)
+            while _base64_cache_bytes > _BASE64_CACHE_MAX_BYTES:
+                _, evicted = _base64_cache.popitem(last=False)  # 移除最久未使用的
+                _base64_cache_bytes -= len(evicted)
+    return image_base64
+
+
+def clear_base64_cache():
+    """释放缓存的 base64 字符串, 注销插件和加载新文件时调用"""
+    global _base64_cache_bytes
+    with _base64_cache_lock:
+        _base64_cache.clear()
+        _base64_cache_bytes = 0
+
+
+def _read_file_base64(file_path: str, size: int, prefix: str) -> str:
+    """分块读取并编码, 不在内存中同时保留完整的原始数据和编码结果
+    前缀直接写入编码缓冲区, 拼接 data URL 时不再复制整个字符串
+    """
+    if size == 0:
+        return prefix
+    with open(file_path, "rb") as f:
+        if size < _BASE64_MMAP_MIN_SIZE:
+            return _encode_base64(f.read(), prefix)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _encode_base64(mm, prefix)
+
+
+def _encode_base64(data, prefix: str) -> str:
+    # 按最终长度预分配, 逐块写入, 避免拼接时反复扩容
+    head = prefix.encode("ascii")
+    buf = bytearray(len(head) + (len(data) + 2) // 3 * 4)
+    buf[:len(head)] = head
+    pos = len(head)
+    with memoryview(data) as view:  # 切片不复制原始数据
+        for start in range(0, len(view), _BASE64_CHUNK_SIZE):
+            encoded = _b64encode_chunk(view[start:start + _BASE64_CHUNK_SIZE])
+            buf[pos:pos + len(encoded)] = encoded
+            pos += len(encoded)
+    return buf.decode("ascii")
+
+
+def file_to_base64(file_path, prefix: str = "") -> str:
+    """读取文件并转为base64字符串
+    按 (路径, 修改时间, 大小) 缓存, 同一张渲染图/参考图多次请求时不再重复读取和编码
+    prefix: 加在结果前面的 ASCII 前缀, 如 "data:image/png;base64,"
+    """
+    file_path = os.fspath(file_path)
+    st = os.stat(file_path)
+    return _encode_file_base64(file_path, st.st_mtime_ns, st.st_size, prefix)
+
+
 def image_file_to_base64(image_file_path):
     """图片写入文件并且转为base64"""
-    with open(image_file_path, "rb") as f:
-        image_base64 = base64.b64encode(f.read()).decode("utf-8")
+    image_base64 = file_to_base64(image_file_path)
     part = {"inline_data": {"mime_type": "image/png", "data": image_base64}}
     base64_size_mb = round(len(image_base64) / (1024 * 1024), 2)
     text = f"To base64 base64_size_mb:{base64_size_mb} path:{image_file_path}"
@@ -8,7 +8,7 @@
 - PNG compression 属性无效
 """
 
-import base64
+import binascii
 import os
 import shutil
 import tempfile
@@ -50,6 +50,23 @@ def guess_image_mime_type(path: str | Path) -> str:
     return "image/png"
 
 
+def _read_file_bytes(path: str | Path) -> bytearray:
+    """按 stat 得到的大小预分配缓冲区, readinto 一次读满(无缓冲, 不经过中间 bytes)"""
+    size = os.stat(path).st_size
+    buf = bytearray(size)
+    view = memoryview(buf)
+    offset = 0
+    with open(path, "rb", buffering=0) as f:
+        while offset < size:
+            n = f.readinto(view[offset:])
+            if not n:  # 读取期间文件被截断
+                del view
+                del buf[offset:]
+                break
+            offset += n
+    return buf
+
+
 # ─── OIIO 内部工具 ───────────────────────────────────────────────────────────
 
 
@@ -462,7 +479,7 @@ class ImageProcessor:
         if not p.is_file():
             raise FileNotFoundError(path)
         mime = guess_image_mime_type(p)
-        raw_b64 = base64.b64encode(p.read_bytes()).decode("utf-8")
+        raw_b64 = binascii.b2a_base64(_read_file_bytes(p), newline=False).decode("ascii")
         size_mb = round(len(raw_b64) / (1024 * 1024), 2)
         logger.info(f"image_to_base64: mime={mime} base64_size_mb={size_mb} path={path}")
         if output_format == "gemini":